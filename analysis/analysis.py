@@ -2,20 +2,27 @@ import argparse
 import logging
 from cmath import sqrt
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Set, Dict, Tuple
+from typing import Set, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import matplotlib
+import numpy as np
 
-from MotiveList import ResultMotive, MotiveList
+from ExecutionBackend import ExecutionBackend
+from MotiveList import ResultMotive
+from MotiveReader import iterate_motives_from_file
 from SequenceType import SequenceType
 
 matplotlib.use("TkAgg")
 
 import pandas as pd
 
+# Below this number of positions per motive, sorting them in Python is faster.
+VECTORIZED_FILTER_MIN_POSITIONS = 256
 
-def parse_args() -> (Path, Path):
+
+def parse_args() -> (Path, Path, bool, ExecutionBackend, Optional[int]):
     parser = argparse.ArgumentParser(description="Plot Motive Generator output")
     parser.add_argument(
         "--inputFile", type=str, help="File containing the output", required=True
@@ -29,23 +36,33 @@ def parse_args() -> (Path, Path):
         help="Filter overlapping positions of motives",
         default=True,
     )
+    parser.add_argument(
+        "--executionBackend",
+        help="Optional flag to select how the overlapping positions of the motives are filtered. Default SERIAL",
+        type=ExecutionBackend.from_string,
+        choices=list(ExecutionBackend),
+        default=ExecutionBackend.SERIAL,
+        metavar="{SERIAL,THREAD,PROCESS}",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Optional number of threads or processes used by the execution backend. Default number of CPUs.",
+        default=None,
+    )
 
     args = parser.parse_args()
     input_file = Path(args.inputFile)
     output_folder = Path(args.outputFolder)
     filter_overlapping_positions_option = args.filterOverlappingPositions
 
-    return input_file, output_folder, filter_overlapping_positions_option
-
-
-def is_overlapping_with_previous_position(position: int, other: int, length: int):
-    return abs(position - other) < length
-
-
-def read_motives_from_json(input_file: Path) -> MotiveList:
-    with open(input_file, "r") as file:
-        json_str = file.read()
-        return MotiveList.model_validate_json(json_str)
+    return (
+        input_file,
+        output_folder,
+        filter_overlapping_positions_option,
+        args.executionBackend,
+        args.workers,
+    )
 
 
 @dataclass
@@ -58,7 +75,6 @@ class MotiveClass:
     frequency_per_sequence_type: Dict[str, int]
     frequency_per_piece: Dict[str, int]
     in_n_pieces: int
-    relative_frequency_per_piece: Dict[str, float]
     mean_relative_frequency: float
     standard_derivation_relative_frequency: float
     weighted_arithmetic_mean: float
@@ -102,14 +118,27 @@ def rearrange_so_original_has_max_value(
 
 
 def main():
-    input_file, output_folder, filter_overlapping_positions_option = parse_args()
+    (
+        input_file,
+        output_folder,
+        filter_overlapping_positions_option,
+        execution_backend,
+        workers,
+    ) = parse_args()
+
+    # The motives are read one at a time, only their motive classes are kept.
+    piece_titles: Set[str] = set()
+    motive_classes: Dict[str, MotiveClass] = {}
 
-    motive_list = read_motives_from_json(input_file)
+    motives = iterate_motives_from_file(input_file)
+    if filter_overlapping_positions_option:
+        motives = filter_overlapping_positions_of_motives(
+            motives, execution_backend, workers
+        )
 
-    piece_titles = extract_piece_titles(motive_list)
-    motive_classes: Dict[str, MotiveClass] = {}
+    for motive in motives:
+        piece_titles.update(get_piece_titles(motive))
 
-    for motive in motive_list.motives:
         intervals_original = str(
             motive.intervals.interval_classes[SequenceType.ORIGINAL]
         )
@@ -123,9 +152,6 @@ def main():
             motive.intervals.interval_classes[SequenceType.MIRRORED_INVERTED]
         )
 
-        if filter_overlapping_positions_option:
-            filter_overlapping_positions(motive)
-
         frequency_per_sequence_type = get_frequency_per_sequence_type(motive)
 
         (
@@ -142,7 +168,7 @@ def main():
             intervals_mirrored_inverted,
         )
 
-        frequency_per_piece = get_frequency_per_piece(piece_titles, motive)
+        frequency_per_piece = get_frequency_per_piece(motive)
 
         in_n_pieces = get_occurance_of_motive_class(frequency_per_piece)
 
@@ -155,13 +181,20 @@ def main():
             frequency_per_sequence_type=frequency_per_sequence_type,
             frequency_per_piece=frequency_per_piece,
             in_n_pieces=in_n_pieces,
-            relative_frequency_per_piece={},
             mean_relative_frequency=0,
             standard_derivation_relative_frequency=0,
             weighted_arithmetic_mean=0,
         )
 
-    motives_per_piece = get_motives_per_piece(motive_classes, piece_titles)
+    # The statistics are computed on a matrix of the frequencies of the motive
+    # classes (columns) in the pieces (rows). Sums over pieces add the pieces
+    # in the same order as summing over piece_titles, so the numbers are the
+    # same as computing them piece by piece.
+    pieces = list(piece_titles)
+    motive_class_list = list(motive_classes.values())
+    frequencies = get_frequency_matrix(motive_class_list, pieces)
+
+    motives_per_piece = get_motives_per_piece(frequencies, pieces)
 
     number_of_pieces = len(piece_titles)
     logging.info(f"Number of pieces: {number_of_pieces}")
@@ -173,23 +206,22 @@ def main():
     logging.info(f"Mean number of motives in piece: {mean_motives_in_piece}")
 
     logging.info("Calculating relative frequencies")
-    for motive_class in motive_classes.values():
-        (
-            relative_frequency_per_piece,
-            mean_relative_frequency,
-            standard_derivation_relative_frequency,
-        ) = calculate_relative_frequency(
-            motive_class, motives_per_piece, number_of_pieces, piece_titles
-        )
-
-        motive_class.relative_frequency_per_piece = relative_frequency_per_piece
+    (
+        relative_frequencies,
+        mean_relative_frequencies,
+        standard_derivation_relative_frequencies,
+    ) = calculate_relative_frequency(frequencies, motives_per_piece, pieces)
+
+    for motive_class, mean_relative_frequency, standard_derivation in zip(
+        motive_class_list,
+        mean_relative_frequencies.tolist(),
+        standard_derivation_relative_frequencies.tolist(),
+    ):
         motive_class.mean_relative_frequency = mean_relative_frequency
-        motive_class.standard_derivation_relative_frequency = (
-            standard_derivation_relative_frequency
-        )
+        motive_class.standard_derivation_relative_frequency = standard_derivation
 
     mean_number_of_motive_classes_per_piece, motive_classes_per_piece = (
-        get_motive_classes_per_piece(motive_classes, number_of_pieces, piece_titles)
+        get_motive_classes_per_piece(frequencies, number_of_pieces, pieces)
     )
 
     correlation_nominator = sum(
@@ -226,24 +258,18 @@ def main():
 
     total_number_of_motives = sum([motives_per_piece[piece] for piece in piece_titles])
 
-    weighted_arithmetic_mean_per_motive = {}
-
-    for key, motive_class in motive_classes.items():
-        weighted_arithmetic_mean_per_motive[key] = (
-            sum(
-                [
-                    motive_class.frequency_per_piece[piece] * motives_per_piece[piece]
-                    for piece in piece_titles
-                ]
-            )
-            / total_number_of_motives
-        )
-        motive_class.weighted_arithmetic_mean = weighted_arithmetic_mean_per_motive[key]
+    motives_in_pieces = np.array([motives_per_piece[piece] for piece in pieces])
+    weighted_sums = sum_over_pieces(frequencies * motives_in_pieces[:, np.newaxis])
+    for motive_class, weighted_sum in zip(motive_class_list, weighted_sums.tolist()):
+        motive_class.weighted_arithmetic_mean = weighted_sum / total_number_of_motives
 
     logging.info("Sorting motives")
-    sorted_motive_classes = dict(
-        sorted(motive_classes.items(), key=lambda item: item[1].frequency, reverse=True)
+    order = sorted(
+        range(len(motive_class_list)),
+        key=lambda index: motive_class_list[index].frequency,
+        reverse=True,
     )
+    sorted_motive_classes = [motive_class_list[index] for index in order]
 
     logging.info("Creating DataFrame")
     columns = [
@@ -261,42 +287,45 @@ def main():
         "standard_derivation_relative_frequency",
         "weighted_arithmetic_mean",
     ]
-    frequency_per_piece_columns = [
-        f"frequency_{piece}" for piece in sorted(piece_titles)
-    ]
-    columns.extend(frequency_per_piece_columns)
-
-    relative_frequency_per_piece_columns = [
-        f"relative_frequency_{piece}" for piece in sorted(piece_titles)
-    ]
-    columns.extend(relative_frequency_per_piece_columns)
-
     rows = []
-    for key, motive_class in sorted_motive_classes.items():
-        row = [
-            motive_class.intervals_original,
-            motive_class.interval_inverted,
-            motive_class.interval_mirrored,
-            motive_class.interval_mirrored_inverted,
-            motive_class.frequency,
-            motive_class.frequency_per_sequence_type["ORIGINAL"],
-            motive_class.frequency_per_sequence_type["INVERTED"],
-            motive_class.frequency_per_sequence_type["MIRRORED"],
-            motive_class.frequency_per_sequence_type["MIRRORED_INVERTED"],
-            motive_class.in_n_pieces,
-            motive_class.mean_relative_frequency,
-            motive_class.standard_derivation_relative_frequency,
-            motive_class.weighted_arithmetic_mean,
-        ]
-        for piece in sorted(piece_titles):
-            row.append(motive_class.frequency_per_piece.get(piece, 0))
-
-        for piece in sorted(piece_titles):
-            row.append(motive_class.relative_frequency_per_piece.get(piece, 0))
+    for motive_class in sorted_motive_classes:
+        rows.append(
+            [
+                motive_class.intervals_original,
+                motive_class.interval_inverted,
+                motive_class.interval_mirrored,
+                motive_class.interval_mirrored_inverted,
+                motive_class.frequency,
+                motive_class.frequency_per_sequence_type["ORIGINAL"],
+                motive_class.frequency_per_sequence_type["INVERTED"],
+                motive_class.frequency_per_sequence_type["MIRRORED"],
+                motive_class.frequency_per_sequence_type["MIRRORED_INVERTED"],
+                motive_class.in_n_pieces,
+                motive_class.mean_relative_frequency,
+                motive_class.standard_derivation_relative_frequency,
+                motive_class.weighted_arithmetic_mean,
+            ]
+        )
 
-        rows.append(row)
+    sorted_pieces = sorted(piece_titles)
+    piece_order = [pieces.index(piece) for piece in sorted_pieces]
+    frequency_per_piece_columns = pd.DataFrame(
+        frequencies[piece_order][:, order].T,
+        columns=[f"frequency_{piece}" for piece in sorted_pieces],
+    )
+    relative_frequency_per_piece_columns = pd.DataFrame(
+        relative_frequencies[piece_order][:, order].T,
+        columns=[f"relative_frequency_{piece}" for piece in sorted_pieces],
+    )
 
-    df = pd.DataFrame(rows, columns=columns)
+    df = pd.concat(
+        [
+            pd.DataFrame(rows, columns=columns),
+            frequency_per_piece_columns,
+            relative_frequency_per_piece_columns,
+        ],
+        axis=1,
+    )
 
     logging.info(f"Writing output to {output_folder}")
     output_folder.mkdir(parents=True, exist_ok=True)
@@ -304,21 +333,41 @@ def main():
     df.to_csv(output_file, index=False)
 
 
+def get_frequency_matrix(
+    motive_classes: List[MotiveClass], pieces: List[str]
+) -> np.ndarray:
+    piece_indices = {piece: index for index, piece in enumerate(pieces)}
+    rows = []
+    columns = []
+    values = []
+    for column, motive_class in enumerate(motive_classes):
+        for piece, frequency in motive_class.frequency_per_piece.items():
+            rows.append(piece_indices[piece])
+            columns.append(column)
+            values.append(frequency)
+
+    frequencies = np.zeros((len(pieces), len(motive_classes)), dtype=np.int64)
+    frequencies[rows, columns] = values
+    return frequencies
+
+
+def sum_over_pieces(values: np.ndarray) -> np.ndarray:
+    # Sums the rows one after another, like summing over the pieces. numpy
+    # sums a single column pairwise, so it is accumulated instead.
+    if values.shape[1] == 1:
+        return np.add.accumulate(values, axis=0)[-1]
+    return values.sum(axis=0)
+
+
 def get_motive_classes_per_piece(
-    motive_classes: Dict[str, MotiveClass],
+    frequencies: np.ndarray,
     number_of_pieces: int,
-    piece_titles: Set[str],
+    pieces: List[str],
 ):
     logging.info("Calculating number of motive classes per piece")
-    motive_classes_per_piece = {}
-    for piece in piece_titles:
-        motive_classes_per_piece[piece] = sum(
-            [
-                1
-                for motive in motive_classes
-                if motive_classes[motive].frequency_per_piece.get(piece, 0) > 0
-            ]
-        )
+    motive_classes_per_piece = dict(
+        zip(pieces, np.count_nonzero(frequencies > 0, axis=1).tolist())
+    )
     mean_number_of_motive_classes_per_piece = (
         sum(motive_classes_per_piece.values()) / number_of_pieces
     )
@@ -334,7 +383,7 @@ def get_motive_classes_per_piece(
                         - mean_number_of_motive_classes_per_piece
                     )
                     ** 2
-                    for piece in piece_titles
+                    for piece in pieces
                 ]
             )
         ).real
@@ -346,46 +395,35 @@ def get_motive_classes_per_piece(
     return mean_number_of_motive_classes_per_piece, motive_classes_per_piece
 
 
-def get_motives_per_piece(motive_classes, piece_titles):
-    motives_in_piece = {}
-    for piece in piece_titles:
-        motives_in_piece[piece] = sum(
-            [
-                motive_class.frequency_per_piece.get(piece, 0)
-                for motive_class in motive_classes.values()
-            ]
-        )
-    return motives_in_piece
+def get_motives_per_piece(frequencies: np.ndarray, pieces: List[str]) -> Dict[str, int]:
+    return dict(zip(pieces, frequencies.sum(axis=1).tolist()))
 
 
 def calculate_relative_frequency(
-    motive_class: MotiveClass, motives_in_piece, number_of_pieces, piece_titles
-):
-    relative_frequency_per_piece = {}
-    for piece in piece_titles:
-        relative_frequency_per_piece[piece] = (
-            motive_class.frequency_per_piece.get(piece, 0) / motives_in_piece[piece]
-        )
-
-    mean_relative_frequency = (
-        sum(relative_frequency_per_piece.values()) / number_of_pieces
-    )
-    standard_derivation_relative_frequency = (
-        sqrt(
-            sum(
-                [
-                    (relative_frequency_per_piece[piece] - mean_relative_frequency) ** 2
-                    for piece in piece_titles
-                ]
+    frequencies: np.ndarray, motives_in_piece: Dict[str, int], pieces: List[str]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # The relative frequencies of all motive classes in all pieces, and their
+    # mean and standard derivation per motive class.
+    number_of_pieces = len(pieces)
+    motives_in_pieces = np.array([motives_in_piece[piece] for piece in pieces])
+    relative_frequencies = frequencies / motives_in_pieces[:, np.newaxis]
+
+    mean_relative_frequencies = sum_over_pieces(relative_frequencies) / number_of_pieces
+    standard_derivation_relative_frequencies = (
+        np.sqrt(
+            # float_power calls pow like ** on floats does, squaring by
+            # multiplying is sometimes rounded differently.
+            sum_over_pieces(
+                np.float_power(relative_frequencies - mean_relative_frequencies, 2)
             )
         )
         / number_of_pieces
-    ).real
+    )
 
     return (
-        relative_frequency_per_piece,
-        mean_relative_frequency,
-        standard_derivation_relative_frequency,
+        relative_frequencies,
+        mean_relative_frequencies,
+        standard_derivation_relative_frequencies,
     )
 
 
@@ -407,9 +445,11 @@ def get_frequency_per_sequence_type(result_motive: ResultMotive):
     return frequency_per_sequence_type
 
 
-def get_frequency_per_piece(piece_titles: Set[str], result_motive: ResultMotive):
+def get_frequency_per_piece(result_motive: ResultMotive):
     logging.info(f"Calculating frequencies per piece")
-    frequency_per_piece = {piece_title: 0 for piece_title in piece_titles}
+    frequency_per_piece = {
+        piece_title: 0 for piece_title in get_piece_titles(result_motive)
+    }
 
     for sequence_type, position_per_sequence_type in result_motive.positions.items():
         for (
@@ -423,88 +463,153 @@ def get_frequency_per_piece(piece_titles: Set[str], result_motive: ResultMotive)
     return frequency_per_piece
 
 
+def filter_overlapping_positions_of_motives(
+    motives: Iterable[ResultMotive],
+    execution_backend: ExecutionBackend = ExecutionBackend.SERIAL,
+    workers: Optional[int] = None,
+) -> Iterator[ResultMotive]:
+    # The motives are filtered independently. They are handed to the executor
+    # in batches, so only a batch of them is in memory at once.
+    executor = execution_backend.create_executor(workers)
+    if executor is None:
+        for motive in motives:
+            filter_overlapping_positions(motive)
+            yield motive
+        return
+
+    motives = iter(motives)
+    try:
+        while batch := list(islice(motives, 1024)):
+            yield from executor.map(filtered_overlapping_positions, batch, chunksize=64)
+    finally:
+        executor.shutdown()
+
+
+def filtered_overlapping_positions(result_motive: ResultMotive) -> ResultMotive:
+    filter_overlapping_positions(result_motive)
+    return result_motive
+
+
 def filter_overlapping_positions(result_motive: ResultMotive):
-    helper_positions_by_piece = {}
-    logging.info(f"Calculating helper positions")
+    # In every voice, the positions of all sequence types are sorted by their
+    # position. A position is kept if it does not overlap with the previous
+    # kept one. The kept positions replace the positions of their sequence
+    # type, sequence types without kept positions are not changed.
+    voice_ids = {}
+    position_lists = []
+    row_objects = []
+    row_voices = []
+    row_lists = []
+    row_positions = []
+    row_lengths = []
     for sequence_type, positions_by_sequence_type in result_motive.positions.items():
         for piece, positions_by_piece in positions_by_sequence_type.items():
-            if piece not in helper_positions_by_piece:
-                helper_positions_by_piece[piece] = {}
             for part, positions_by_part in positions_by_piece.items():
-                if part not in helper_positions_by_piece[piece]:
-                    helper_positions_by_piece[piece][part] = {}
                 for voice, positions_by_voice in positions_by_part.items():
-                    if voice not in helper_positions_by_piece[piece][part]:
-                        helper_positions_by_piece[piece][part][voice] = {}
-                    helper_positions_by_piece[piece][part][voice][sequence_type] = (
-                        positions_by_voice
+                    voice_id = voice_ids.setdefault(
+                        (piece, part, voice), len(voice_ids)
+                    )
+                    count = len(positions_by_voice)
+                    row_objects.extend(positions_by_voice)
+                    row_voices.extend([voice_id] * count)
+                    row_lists.extend([len(position_lists)] * count)
+                    row_positions.extend(
+                        [position.position for position in positions_by_voice]
+                    )
+                    row_lengths.extend(
+                        [position.length for position in positions_by_voice]
                     )
+                    position_lists.append((sequence_type, piece, part, voice))
+
+    if not row_positions:
+        return
+
+    if len(row_positions) < VECTORIZED_FILTER_MIN_POSITIONS:
+        kept_rows_by_list = get_kept_rows_by_list(
+            row_voices, row_lists, row_positions, row_lengths
+        )
+    else:
+        kept_rows_by_list = get_kept_rows_by_list_vectorized(
+            row_voices, row_lists, row_positions, row_lengths
+        )
+
+    for list_id, kept_rows in kept_rows_by_list.items():
+        sequence_type, piece, part, voice = position_lists[list_id]
+        result_motive.positions[sequence_type][piece][part][voice] = list(
+            map(row_objects.__getitem__, kept_rows)
+        )
+
+
+def get_kept_rows_by_list(
+    row_voices: List[int],
+    row_lists: List[int],
+    row_positions: List[int],
+    row_lengths: List[int],
+) -> Dict[int, List[int]]:
+    # Rows sorted by voice and position, positions of the same voice at the
+    # same position keep the order of their sequence types.
+    order = sorted(
+        range(len(row_positions)),
+        key=lambda row: (row_voices[row], row_positions[row]),
+    )
+    kept_rows_by_list = {}
+    previous_voice = None
+    previous_end = 0
+    for row in order:
+        if row_voices[row] == previous_voice and row_positions[row] < previous_end:
+            continue
+        previous_voice = row_voices[row]
+        previous_end = row_positions[row] + row_lengths[row]
+        kept_rows_by_list.setdefault(row_lists[row], []).append(row)
+    return kept_rows_by_list
+
+
+def get_kept_rows_by_list_vectorized(
+    row_voices: List[int],
+    row_lists: List[int],
+    row_positions: List[int],
+    row_lengths: List[int],
+) -> Dict[int, List[int]]:
+    # Same as get_kept_rows_by_list, but the rows are sorted with numpy.
+    voices = np.array(row_voices, dtype=np.int64)
+    positions = np.array(row_positions, dtype=np.int64)
+    order = np.lexsort((positions, voices))
+    keys = (voices[order] << 32) + positions[order]
+    lengths = np.array(row_lengths, dtype=np.int64)[order]
+
+    # The next kept row after a kept row is the first one of its voice that
+    # does not overlap with it, or the first row of the next voice.
+    next_rows = np.maximum(
+        np.searchsorted(keys, keys + lengths, side="left"),
+        np.arange(1, len(keys) + 1),
+    ).tolist()
+    kept_rows = []
+    row = 0
+    while row < len(next_rows):
+        kept_rows.append(row)
+        row = next_rows[row]
+
+    # The kept rows grouped by the list they come from, still sorted by their
+    # position within each list.
+    kept = order[kept_rows]
+    kept_lists = np.array(row_lists, dtype=np.int64)[kept]
+    by_list = np.argsort(kept_lists, kind="stable")
+    kept = kept[by_list].tolist()
+    list_ids, list_starts = np.unique(kept_lists[by_list], return_index=True)
+    list_ends = np.append(list_starts[1:], len(kept))
+    return {
+        list_id: kept[start:end]
+        for list_id, start, end in zip(
+            list_ids.tolist(), list_starts.tolist(), list_ends.tolist()
+        )
+    }
 
-    logging.info(f"Filtering all positions")
-    for piece, positions_by_piece in helper_positions_by_piece.items():
-        for part, positions_by_part in positions_by_piece.items():
-            for voice, positions_by_voice in positions_by_part.items():
-                all_positions_per_voice = []
-                for (
-                    sequence_type,
-                    positions_by_sequence_type,
-                ) in positions_by_voice.items():
-                    enumerated_positions = [
-                        {"position": position, "sequenceType": sequence_type}
-                        for position in positions_by_sequence_type
-                    ]
-                    all_positions_per_voice.extend(enumerated_positions)
-
-                # sort by position
-                all_positions_per_voice = sorted(
-                    all_positions_per_voice, key=lambda x: x["position"].position
-                )
 
-                # remove overlapping positions
-                filtered_positions = []
-                for i, position in enumerate(all_positions_per_voice):
-                    if i == 0:
-                        filtered_positions.append(position)
-                    else:
-                        if not is_overlapping_with_previous_position(
-                            position["position"].position,
-                            filtered_positions[-1]["position"].position,
-                            filtered_positions[-1]["position"].length,
-                        ):
-                            filtered_positions.append(position)
-
-                # split by sequence type
-                filtered_positions_per_sequence_type = {}
-                for position in filtered_positions:
-                    if (
-                        position["sequenceType"]
-                        not in filtered_positions_per_sequence_type
-                    ):
-                        filtered_positions_per_sequence_type[
-                            position["sequenceType"]
-                        ] = []
-                    filtered_positions_per_sequence_type[
-                        position["sequenceType"]
-                    ].append(position["position"])
-
-                for sequence_type in filtered_positions_per_sequence_type:
-                    if piece in result_motive.positions[sequence_type]:
-                        if part in result_motive.positions[sequence_type][piece]:
-                            if (
-                                voice
-                                in result_motive.positions[sequence_type][piece][part]
-                            ):
-                                result_motive.positions[sequence_type][piece][part][
-                                    voice
-                                ] = filtered_positions_per_sequence_type[sequence_type]
-
-
-def extract_piece_titles(motive_list: MotiveList):
+def get_piece_titles(result_motive: ResultMotive) -> Set[str]:
     all_pieces = set()
-    for motive in motive_list.motives:
-        for pieces in motive.positions.values():
-            for piece in pieces.keys():
-                all_pieces.add(piece)
+    for pieces in result_motive.positions.values():
+        for piece in pieces.keys():
+            all_pieces.add(piece)
     return all_pieces
 
 
@@ -1,10 +1,13 @@
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
 
 from music21.note import Note
 
+from EncodedVoice import EncodedVoice
+from ParseCache import ParseCache
 from ParseOptions import ParseOptions
 from Piece import Piece
 
@@ -15,7 +18,11 @@ class Corpus:
 
     @classmethod
     def parse(
-        cls, input_folder: Path, options: Optional[ParseOptions] = None
+        cls,
+        input_folder: Path,
+        options: Optional[ParseOptions] = None,
+        workers: int = 1,
+        cache: Optional[ParseCache] = None,
     ) -> "Corpus":
         logging.info(f"Reading folder {input_folder}")
         is_xml = (
@@ -24,7 +31,22 @@ class Corpus:
         )
         file_paths = [file for file in input_folder.iterdir() if is_xml(file)]
 
-        pieces = [Piece.parse(file, options) for file in file_paths]
+        if cache is None:
+            return cls(parse_files(file_paths, options, workers))
+
+        keys = [cache.key(file, options) for file in file_paths]
+        pieces = [cache.load(key, file.stem) for key, file in zip(keys, file_paths)]
+        missing = [index for index, piece in enumerate(pieces) if piece is None]
+        logging.info(f"Found {len(file_paths) - len(missing)} files in the cache")
+
+        parsed_pieces = parse_files(
+            [file_paths[index] for index in missing], options, workers
+        )
+        for index, piece in zip(missing, parsed_pieces):
+            pieces[index] = piece.encode()
+            cache.store(keys[index], pieces[index])
+        cache.evict()
+
         return cls(pieces)
 
     def remove_accidentals(self):
@@ -32,6 +54,28 @@ class Corpus:
         for piece in self.pieces:
             for part in piece.parts:
                 for voice in part.voices:
+                    # Encoded voices only keep diatonic note numbers, which do
+                    # not depend on accidentals.
+                    if isinstance(voice, EncodedVoice):
+                        continue
                     for note in voice.notes:
                         if isinstance(note, Note):
                             note.pitch.accidental = None
+
+
+def parse_files(
+    file_paths: List[Path], options: Optional[ParseOptions], workers: int
+) -> List[Piece]:
+    if workers > 1 and len(file_paths) > 1:
+        logging.info(f"Parsing {len(file_paths)} files with {workers} workers")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    parse_encoded_piece, file_paths, [options] * len(file_paths)
+                )
+            )
+    return [Piece.parse(file, options) for file in file_paths]
+
+
+def parse_encoded_piece(file: Path, options: Optional[ParseOptions]) -> Piece:
+    return Piece.parse(file, options).encode()
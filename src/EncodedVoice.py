@@ -0,0 +1,33 @@
+from array import array
+from dataclasses import dataclass
+
+from music21.note import Note
+
+from Voice import Voice
+
+REST = -(2**15)
+
+
+@dataclass
+class EncodedVoice:
+    id: str
+    diatonic_note_numbers: array
+
+    @classmethod
+    def from_voice(cls, voice: Voice) -> "EncodedVoice":
+        return cls(
+            id=voice.id,
+            diatonic_note_numbers=array(
+                "h",
+                [
+                    note.pitch.diatonicNoteNum if isinstance(note, Note) else REST
+                    for note in voice.notes
+                ],
+            ),
+        )
+
+    def is_rest(self, index: int) -> bool:
+        return self.diatonic_note_numbers[index] == REST
+
+    def __len__(self) -> int:
+        return len(self.diatonic_note_numbers)
@@ -0,0 +1,21 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from typing import Optional
+
+
+class ExecutionBackend(Enum):
+    SERIAL = 0
+    THREAD = 1
+    PROCESS = 2
+
+    def create_executor(self, workers: Optional[int] = None) -> Optional[Executor]:
+        if self is ExecutionBackend.THREAD:
+            return ThreadPoolExecutor(max_workers=workers)
+        elif self is ExecutionBackend.PROCESS:
+            return ProcessPoolExecutor(max_workers=workers)
+        return None
+
+    @classmethod
+    def from_string(cls, s: str) -> "ExecutionBackend":
+        lower_map = {member.name.lower(): member for member in cls}
+        return lower_map.get(s.lower().replace("-", "_"))
@@ -1,8 +1,12 @@
 from enum import IntEnum
-from typing import List
+from typing import List, Sequence, Tuple
 
 from pydantic import BaseModel
 
+# Intervals and breaks share one int16 alphabet: an interval is stored as its
+# directed generic value, a break as BREAK_CODE_OFFSET plus its type.
+BREAK_CODE_OFFSET = -(2**15)
+
 
 class RestIntervalType(IntEnum):
     NOTE_BEFORE = 0
@@ -14,6 +18,9 @@ class RestIntervalType(IntEnum):
         return self.name
 
 
+_BREAK_CODES_END = BREAK_CODE_OFFSET + len(RestIntervalType)
+
+
 class BreakInterval(BaseModel):
     type: RestIntervalType
 
@@ -71,3 +78,33 @@ class IntervalList(BaseModel):
 
     def __str__(self) -> str:
         return str([interval.name for interval in self.intervals])
+
+    @classmethod
+    def from_codes(cls, codes: Sequence[int]) -> "IntervalList":
+        return cls(intervals=[decode_interval(code) for code in codes])
+
+    def codes(self) -> Tuple[int, ...]:
+        return tuple(encode_interval(interval) for interval in self.intervals)
+
+
+def encode_interval(interval: Interval | BreakInterval) -> int:
+    if isinstance(interval, BreakInterval):
+        return BREAK_CODE_OFFSET + interval.type
+    return interval.interval
+
+
+def decode_interval(code: int) -> Interval | BreakInterval:
+    if is_break_code(code):
+        return BreakInterval(type=RestIntervalType(code - BREAK_CODE_OFFSET))
+    return Interval(interval=code)
+
+
+def is_break_code(code: int) -> bool:
+    return code < _BREAK_CODES_END
+
+
+def invert_code(code: int) -> int:
+    # Same as Interval.inverted and BreakInterval.inverted.
+    if code == 1 or code < _BREAK_CODES_END:
+        return code
+    return -code
@@ -3,12 +3,18 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
+from typing import Optional
 
+from ExecutionBackend import ExecutionBackend
+from MiningEngine import MiningEngine
+from OutputCompression import OutputCompression
+from OutputFormat import OutputFormat
 from ParseOptions import (
     ParseOptions,
     RestTreatment,
     AccidentalTreatment,
     ChordTreatment,
+    ParserBackend,
 )
 
 
@@ -31,6 +37,11 @@ class MotiveGeneratorOptions:
     max_length: int
     min_num_sequences: int
     max_num_sequences: int
+    execution_backend: ExecutionBackend = ExecutionBackend.SERIAL
+    workers: Optional[int] = None
+    engine: MiningEngine = MiningEngine.AUTO
+    prune_breaks: bool = True
+    columnar_positions: bool = False
 
 
 @dataclass
@@ -38,6 +49,12 @@ class ParserOptions:
     input_folder: Path
     output_folder: Path
     options: ParseOptions = ParseOptions()
+    parse_workers: int = 1
+    cache_folder: Optional[Path] = None
+    cache_max_size: int = 1024
+    output_compression: OutputCompression = OutputCompression.NONE
+    pretty_output: bool = True
+    output_format: OutputFormat = OutputFormat.JSON
 
 
 def parse_args() -> (MotiveGeneratorOptions, ParserOptions):
@@ -109,6 +126,100 @@ def parse_args() -> (MotiveGeneratorOptions, ParserOptions):
         metavar="{HIGHEST,LOWEST,REMOVE}",
     )
 
+    parser.add_argument(
+        "--parserBackend",
+        help="Optional flag to select how the input files are read. STREAMING reads the MusicXML directly and falls back to music21 for unsupported files. Default MUSIC21",
+        type=ParserBackend.from_string,
+        choices=list(ParserBackend),
+        default=ParseOptions.parser_backend,
+        metavar="{MUSIC21,STREAMING}",
+    )
+
+    parser.add_argument(
+        "--engine",
+        help="Optional flag to select the algorithm generating the motives. AUTO uses NGRAM for a max gap of 0 and a single number of sequences, SUFFIX_ARRAY for other searches with a max gap of 0 and PREFIX_SPAN otherwise. Default AUTO",
+        type=MiningEngine.from_string,
+        choices=list(MiningEngine),
+        default=MiningEngine.AUTO,
+        metavar="{AUTO,LEVELWISE,SUFFIX_ARRAY,PREFIX_SPAN,VERTICAL,NGRAM}",
+    )
+
+    parser.add_argument(
+        "--pruneBreaks",
+        action=argparse.BooleanOptionalAction,
+        help="Do not extend motives by rests while generating them. Rests can still be skipped by gaps. Default True",
+        default=True,
+    )
+
+    parser.add_argument(
+        "--columnarPositions",
+        action=argparse.BooleanOptionalAction,
+        help="Store the positions of the found motives in compact tables instead of nested lists, which needs much less memory for large results. The output is the same. Default False",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--executionBackend",
+        help="Optional flag to select how the voices are processed when generating motives. Default SERIAL",
+        type=ExecutionBackend.from_string,
+        choices=list(ExecutionBackend),
+        default=ExecutionBackend.SERIAL,
+        metavar="{SERIAL,THREAD,PROCESS}",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Optional number of threads or processes used by the execution backend. Default number of CPUs.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--parseWorkers",
+        type=int,
+        help="Optional number of processes used to parse the input files. Default 1.",
+        default=1,
+    )
+
+    parser.add_argument(
+        "--cacheFolder",
+        type=str,
+        help="Optional folder to cache the parsed voices of the input files between runs.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--cacheMaxSize",
+        type=int,
+        help="Optional maximal size of the cache folder in megabytes. Default 1024.",
+        default=1024,
+    )
+
+    parser.add_argument(
+        "--outputFormat",
+        help="Optional flag to select the format of the output file. NPZ writes a table of the motives and a table of their positions with numpy, SQLITE an indexed SQLite database. Default JSON",
+        type=OutputFormat.from_string,
+        choices=list(OutputFormat),
+        default=OutputFormat.JSON,
+        metavar="{JSON,NPZ,SQLITE}",
+    )
+
+    parser.add_argument(
+        "--outputCompression",
+        help="Optional flag to compress the output JSON file. ZSTD needs the zstandard package. Default NONE",
+        type=OutputCompression.from_string,
+        choices=list(OutputCompression),
+        default=OutputCompression.NONE,
+        metavar="{NONE,GZIP,ZSTD}",
+    )
+
+    parser.add_argument(
+        "--prettyOutput",
+        action=argparse.BooleanOptionalAction,
+        help="Indent the output JSON file. Default True",
+        default=True,
+    )
+
     args = parser.parse_args()
     motive_generator_options = MotiveGeneratorOptions(
         args.minFrequency,
@@ -116,6 +227,11 @@ def parse_args() -> (MotiveGeneratorOptions, ParserOptions):
         args.maxLength,
         args.minNumSequences,
         args.maxNumSequences,
+        args.executionBackend,
+        args.workers,
+        args.engine,
+        args.pruneBreaks,
+        args.columnarPositions,
     )
     parsers_options = ParserOptions(
         Path(args.inputFolder),
@@ -124,7 +240,14 @@ def parse_args() -> (MotiveGeneratorOptions, ParserOptions):
             args.restTreatment,
             args.chordTreatment,
             args.accidentalTreatment,
+            args.parserBackend,
         ),
+        args.parseWorkers,
+        Path(args.cacheFolder) if args.cacheFolder is not None else None,
+        args.cacheMaxSize,
+        args.outputCompression,
+        args.prettyOutput,
+        args.outputFormat,
     )
 
     logging.info(f"Motive generator options: {motive_generator_options}")
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class MiningEngine(Enum):
+    AUTO = 0
+    LEVELWISE = 1
+    SUFFIX_ARRAY = 2
+    PREFIX_SPAN = 3
+    VERTICAL = 4
+    NGRAM = 5
+
+    @classmethod
+    def from_string(cls, s: str) -> "MiningEngine":
+        lower_map = {member.name.lower(): member for member in cls}
+        return lower_map.get(s.lower().replace("-", "_"))
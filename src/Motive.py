@@ -1,14 +1,17 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Tuple
 
-from GeneralInterval import BreakInterval, Interval
-from MotivePosition import MotivePosition
+from Occurrence import Occurrence
+from Orbit import Orbit
 
 
 @dataclass
 class Motive:
-    positions: List[MotivePosition]
-    sequence: List[BreakInterval | Interval]
+    positions: List[Occurrence]
+    # Interval and break codes, see GeneralInterval.encode_interval.
+    sequence: Tuple[int, ...]
+    # Set by MotiveGenerator, so motives are matched by their orbit.
+    orbit: Optional[Orbit] = None
 
     def __str__(self):
         return f"{self.sequence},{self.frequency},{self.positions}"
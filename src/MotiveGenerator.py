@@ -1,16 +1,22 @@
 import logging
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from Corpus import Corpus
-from GeneralInterval import Interval
+from ExecutionBackend import ExecutionBackend
+from GeneralInterval import is_break_code
+from MiningEngine import MiningEngine
 from Motive import Motive
 from MotiveList import MotiveList
-from MotivePosition import MotivePosition
+from Occurrence import Occurrence
+from Orbit import Orbit
 from MotiveUnitGenerator import MotiveUnitGenerator
+from ParseCache import ParseCache
 from ParseOptions import ParseOptions, AccidentalTreatment
 from PositionSequence import PositionSequence
+from SuffixArray import rank_by_first_appearance, suffix_array, lcp_array
 
 
 class MotiveGenerator:
@@ -21,16 +27,58 @@ class MotiveGenerator:
         max_length: int,
         min_num_sequences: int,
         max_num_sequences: int,
+        execution_backend: ExecutionBackend = ExecutionBackend.SERIAL,
+        workers: Optional[int] = None,
+        engine: MiningEngine = MiningEngine.AUTO,
+        prune_breaks: bool = True,
+        columnar_positions: bool = False,
     ):
         self.min_frequency = min_frequency
         self.max_gap = max_gap
         self.max_length = max_length
         self.min_num_sequences = min_num_sequences
         self.max_num_sequences = max_num_sequences
+        self.execution_backend = execution_backend
+        self.workers = workers
+        # Motives with a single interval are never returned and at least one
+        # extension is done, so the motives have between min_depth and
+        # max_depth intervals.
+        self.min_depth = max(2, min_num_sequences)
+        self.max_depth = max(2, max_num_sequences)
+        if engine is MiningEngine.AUTO:
+            if max_gap != 0:
+                engine = MiningEngine.PREFIX_SPAN
+            elif self.min_depth == self.max_depth:
+                engine = MiningEngine.NGRAM
+            else:
+                engine = MiningEngine.SUFFIX_ARRAY
+        elif engine is MiningEngine.SUFFIX_ARRAY and max_gap != 0:
+            raise ValueError("The suffix array engine only supports a max gap of 0")
+        elif engine is MiningEngine.NGRAM and (
+            max_gap != 0 or self.min_depth != self.max_depth
+        ):
+            raise ValueError(
+                "The n-gram engine only supports a max gap of 0 and motives of a single length"
+            )
+        self.engine = engine
+        # Motives containing breaks are never returned. With prune_breaks
+        # they are not generated at all, breaks can still be skipped by gaps.
+        self.prune_breaks = prune_breaks
+        # Store the positions of the result in occurrence tables, which takes
+        # much less memory for large results.
+        self.columnar_positions = columnar_positions
 
-    def discover_motives(self, file_path: Path, options: ParseOptions) -> MotiveList:
+    def discover_motives(
+        self,
+        file_path: Path,
+        options: ParseOptions,
+        parse_workers: int = 1,
+        parse_cache: Optional[ParseCache] = None,
+    ) -> MotiveList:
         logging.info(f"Discovering motives in {file_path}")
-        corpus = Corpus.parse(file_path, options)
+        corpus = Corpus.parse(
+            file_path, options, workers=parse_workers, cache=parse_cache
+        )
 
         if options.accidental_treatment is AccidentalTreatment.REMOVE_ACCIDENTALS:
             corpus.remove_accidentals()
@@ -38,54 +86,116 @@ class MotiveGenerator:
         motive_unit_generator = MotiveUnitGenerator()
         all_motive_units = motive_unit_generator.from_corpus(corpus)
 
-        all_motives = MotiveList(motives=[])
-        for piece in all_motive_units:
-            logging.info(f"Processing piece {piece}")
-            for part in all_motive_units[piece]:
-                logging.info(f"Processing part {part}")
-                for voice in all_motive_units[piece][part]:
-                    logging.info(f"Processing voice {voice}")
-                    motive_units = all_motive_units[piece][part][voice]
-                    motives = self.generate_motives(motive_units)
-                    motives = self.remove_motives_with_breaks(motives)
+        voices = [
+            (piece, part, voice)
+            for piece in all_motive_units
+            for part in all_motive_units[piece]
+            for voice in all_motive_units[piece][part]
+        ]
+        voice_motive_units = [
+            all_motive_units[piece][part][voice] for piece, part, voice in voices
+        ]
 
-                    all_motives.add(motives, piece, part, voice)
+        # Voices are mined independently, so they are the unit of work for
+        # the executor. The results are added in the original voice order.
+        if self.columnar_positions:
+            all_motives = MotiveList.columnar()
+        else:
+            all_motives = MotiveList(motives=[])
+        executor = self.execution_backend.create_executor(self.workers)
+        try:
+            if executor is None:
+                results = map(self.find_voice_motives, voice_motive_units)
+            else:
+                logging.info(
+                    f"Generating motives of {len(voices)} voices with the "
+                    f"{self.execution_backend.name} backend"
+                )
+                results = executor.map(self.find_voice_motives, voice_motive_units)
+
+            for (piece, part, voice), motives in zip(voices, results):
+                logging.info(f"Adding motives of {piece}, part {part}, voice {voice}")
+                all_motives.add(motives, piece, part, voice)
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         return all_motives
 
+    def find_voice_motives(self, motive_units: Sequence[int]) -> List[Motive]:
+        motives = self.generate_motives(motive_units)
+        if not self.prune_breaks:
+            motives = self.remove_motives_with_breaks(motives)
+        # Matching the motives of all voices by their orbit is cheaper than
+        # comparing every sequence type. It is computed here, so it runs in
+        # the workers of the execution backend.
+        for motive in motives:
+            motive.orbit = Orbit.from_codes(motive.sequence)
+        return motives
+
     def remove_motives_with_breaks(self, motives: List[Motive]) -> List[Motive]:
         logging.info("Removing motives with breaks")
         return [
             motive
             for motive in motives
-            if all(isinstance(motive_unit, Interval) for motive_unit in motive.sequence)
+            if not any(is_break_code(code) for code in motive.sequence)
         ]
 
     def generate_motives(
         self,
-        sequence: List[Motive],
+        sequence: Sequence[int],
+    ) -> List[Motive]:
+        if self.engine is MiningEngine.NGRAM:
+            return self.generate_ngram_motives(sequence)
+        if self.engine is MiningEngine.SUFFIX_ARRAY:
+            return self.generate_motives_with_suffix_array(sequence)
+        if self.engine is MiningEngine.PREFIX_SPAN:
+            return self.generate_motives_with_projections(sequence)
+        if self.engine is MiningEngine.VERTICAL:
+            return self.generate_motives_with_bitsets(sequence)
+        return self.generate_motives_levelwise(sequence)
+
+    def generate_motives_levelwise(
+        self,
+        sequence: Sequence[int],
     ) -> List[Motive]:
         logging.info("Generating motives")
         basic_motives = self.get_basic_motives(sequence)
+        if self.prune_breaks:
+            basic_motives = self.remove_motives_with_breaks(basic_motives)
+        frequent_basic_motives = self.remove_infrequent_motives(basic_motives)
+        # An extension occurs at most once per occurrence of its prefix, so
+        # infrequent prefixes can never become frequent. Without gaps this
+        # also holds for the appended basic motive, with gaps several
+        # occurrences of the prefix can be extended by the same one.
+        if self.max_gap == 0:
+            basic_motives = frequent_basic_motives
+        basic_starts = {
+            motive.sequence: position_starts(motive) for motive in basic_motives
+        }
+        basic_motive_index = np.full(len(sequence), -1, dtype=np.int64)
+        for index, motive in enumerate(basic_motives):
+            basic_motive_index[basic_starts[motive.sequence]] = index
         motives_of_all_iterations = []
 
-        current_motive = basic_motives.copy()
+        current_motive = frequent_basic_motives.copy()
 
         while current_motive:
             logging.info(f"Current motives: {len(current_motive)}")
             new_motives: List[Motive] = []
             for motive in current_motive:
                 logging.info(f"Current motive: {motive.sequence}")
-                frequent_position = self.get_frequent_position(motive)
                 candidate_extensions = self.generate_candidate_extension(
-                    basic_motives, frequent_position
+                    motive, basic_motives, basic_motive_index
                 )
                 logging.info(f"Found {len(candidate_extensions)} candidate extensions")
                 for candidate in candidate_extensions:
-                    merged = self.merge_motives(motive, candidate)
+                    merged = self.merge_motives(
+                        motive, candidate, basic_starts[candidate.sequence]
+                    )
                     if merged is not None:
                         new_motives.append(merged)
-            current_motive = new_motives
+            current_motive = self.remove_infrequent_motives(new_motives)
 
             motives_to_add_to_all_iterations = [
                 motive
@@ -105,16 +215,371 @@ class MotiveGenerator:
 
         return motives_of_all_iterations
 
-    def get_basic_motives(self, sequence: List[Motive]) -> List[Motive]:
-        logging.info("Getting basic motives")
-        basic_motives: dict[str, Motive] = {}
-        for index, motive in enumerate(sequence):
-            name = motive.sequence[0].name
-            if name not in basic_motives:
-                basic_motives[name] = Motive(sequence=motive.sequence, positions=[])
-            basic_motives[name].positions.append(
-                MotivePosition(position=index, length=1)
+    def generate_ngram_motives(
+        self,
+        sequence: Sequence[int],
+    ) -> List[Motive]:
+        # Without gaps and with a single motive length n the motives are the
+        # windows of n intervals. Each window is packed into one integer of
+        # the interval ranks, so sorting the keys orders the motives like
+        # the levelwise engine.
+        logging.info("Generating motives from n-grams")
+        length = self.min_depth
+        codes = np.asarray(sequence, dtype=np.int64)
+        if length > self.max_length or len(codes) < length:
+            return []
+        ranks = rank_by_first_appearance(codes)
+        windows = np.lib.stride_tricks.sliding_window_view(ranks, length)
+        window_starts = np.flatnonzero(
+            self.extendable_lengths(codes)[: len(windows)] >= length
+        )
+        if len(window_starts) == 0:
+            return []
+        windows = windows[window_starts]
+        num_ranks = int(ranks.max()) + 1
+        if num_ranks**length < 2**63:
+            keys = windows @ (num_ranks ** np.arange(length - 1, -1, -1))
+            _, first_windows, inverse, counts = np.unique(
+                keys, return_index=True, return_inverse=True, return_counts=True
+            )
+        else:
+            _, first_windows, inverse, counts = np.unique(
+                windows,
+                axis=0,
+                return_index=True,
+                return_inverse=True,
+                return_counts=True,
+            )
+        starts = window_starts[np.argsort(inverse.reshape(-1), kind="stable")]
+        boundaries = np.concatenate(([0], np.cumsum(counts))).tolist()
+        code_list = codes.tolist()
+
+        motives: List[Motive] = []
+        for key in np.flatnonzero(counts >= self.min_frequency).tolist():
+            first = int(window_starts[first_windows[key]])
+            motives.append(
+                Motive(
+                    sequence=tuple(code_list[first : first + length]),
+                    positions=[
+                        Occurrence(position=start, length=length)
+                        for start in starts[
+                            boundaries[key] : boundaries[key + 1]
+                        ].tolist()
+                    ],
+                )
+            )
+        return motives
+
+    def generate_motives_with_suffix_array(
+        self,
+        sequence: Sequence[int],
+    ) -> List[Motive]:
+        # Without gaps the motives with n intervals are the distinct
+        # substrings of length n. They are found as runs of suffixes sharing
+        # a prefix of length n. Ranking the codes by first appearance makes
+        # the suffix order the order in which the levelwise engine extends
+        # the motives.
+        logging.info("Generating motives with a suffix array")
+        codes = np.asarray(sequence, dtype=np.int64)
+        ranks = rank_by_first_appearance(codes)
+        suffixes = suffix_array(ranks)
+        lcp = lcp_array(ranks, suffixes)
+        suffix_lengths = self.extendable_lengths(codes)[suffixes]
+        code_list = codes.tolist()
+
+        min_length = self.min_depth
+        max_length = min(self.max_depth, self.max_length)
+
+        motives: List[Motive] = []
+        for length in range(min_length, max_length + 1):
+            indices = np.flatnonzero(suffix_lengths >= length)
+            if len(indices) == 0:
+                break
+
+            run_starts = np.ones(len(indices), dtype=bool)
+            run_starts[1:] = (lcp[indices[1:]] < length) | (
+                indices[1:] != indices[:-1] + 1
             )
+            boundaries = np.flatnonzero(run_starts).tolist() + [len(indices)]
+            starts = suffixes[indices]
+
+            level: List[Motive] = []
+            for begin, end in zip(boundaries[:-1], boundaries[1:]):
+                if end - begin < self.min_frequency:
+                    continue
+                positions = np.sort(starts[begin:end]).tolist()
+                level.append(
+                    Motive(
+                        sequence=tuple(code_list[positions[0] : positions[0] + length]),
+                        positions=[
+                            Occurrence(position=position, length=length)
+                            for position in positions
+                        ],
+                    )
+                )
+            if not level:
+                break
+            motives.extend(level)
+
+        return motives
+
+    def generate_motives_with_projections(
+        self,
+        sequence: Sequence[int],
+    ) -> List[Motive]:
+        # Grows the motives depth first. A motive only keeps the starts and
+        # ends of its occurrences, its extensions are read from the intervals
+        # following these ends. The motives are collected per number of
+        # intervals and returned in the order of the levelwise engine.
+        logging.info("Generating motives with projected occurrences")
+        codes = np.asarray(sequence, dtype=np.int64)
+        if len(codes) == 0:
+            return []
+        ranks, rank_codes, last_positions = self.rank_intervals(codes)
+        num_ranks = len(rank_codes)
+
+        min_depth = self.min_depth
+        max_depth = self.max_depth
+        levels: List[List[Motive]] = [[] for _ in range(max_depth + 1)]
+
+        counts = np.bincount(ranks, minlength=num_ranks)
+        boundaries = np.concatenate(([0], np.cumsum(counts))).tolist()
+        basic_starts = np.argsort(ranks, kind="stable")
+        stack = []
+        for rank in reversed(range(num_ranks)):
+            if counts[rank] >= self.min_frequency and last_positions[rank] >= 0:
+                starts = basic_starts[boundaries[rank] : boundaries[rank + 1]]
+                stack.append(((rank_codes[rank],), starts, starts + 1))
+
+        while stack:
+            motive_sequence, starts, ends = stack.pop()
+            depth = len(motive_sequence)
+            if depth >= min_depth:
+                levels[depth].append(
+                    Motive(
+                        sequence=motive_sequence,
+                        positions=[
+                            Occurrence(position=start, length=end - start)
+                            for start, end in zip(starts.tolist(), ends.tolist())
+                        ],
+                    )
+                )
+            if depth >= max_depth:
+                continue
+            extensions = self.project_extensions(ranks, last_positions, starts, ends)
+            for rank, extension_starts, extension_ends in reversed(extensions):
+                stack.append(
+                    (
+                        motive_sequence + (rank_codes[rank],),
+                        extension_starts,
+                        extension_ends,
+                    )
+                )
+
+        return [motive for level in levels for motive in level]
+
+    def extension_windows(
+        self, starts: np.ndarray, ends: np.ndarray, size: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # The positions an occurrence can be extended with: at most max_gap
+        # after its end and within max_length, see join_positions. Returns
+        # the index of the occurrence and the position, ordered by both.
+        window = min(self.max_gap, max(0, self.max_length - 2)) + 1
+        limits = np.minimum(ends + self.max_gap, starts + self.max_length - 1)
+        limits = np.minimum(limits, size - 1)
+
+        positions = ends[:, None] + np.arange(window)
+        valid = positions <= limits[:, None]
+        occurrences = np.broadcast_to(np.arange(len(starts))[:, None], positions.shape)
+        return occurrences[valid], positions[valid]
+
+    def project_extensions(
+        self,
+        ranks: np.ndarray,
+        last_positions: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+    ) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+        # Every occurrence is extended with the first interval of each rank
+        # in its window, see join_positions. Like generate_candidate_extension,
+        # only intervals which occur after the first occurrence are used.
+        occurrences, positions = self.extension_windows(starts, ends, len(ranks))
+        position_ranks = ranks[positions]
+
+        allowed = last_positions[position_ranks] >= ends[0]
+        occurrences = occurrences[allowed]
+        positions = positions[allowed]
+        position_ranks = position_ranks[allowed]
+
+        order = np.argsort(position_ranks, kind="stable")
+        occurrences = occurrences[order]
+        positions = positions[order]
+        position_ranks = position_ranks[order]
+
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (position_ranks[1:] != position_ranks[:-1]) | (
+            occurrences[1:] != occurrences[:-1]
+        )
+        occurrences = occurrences[first]
+        positions = positions[first]
+        position_ranks = position_ranks[first]
+
+        run_starts = np.ones(len(position_ranks), dtype=bool)
+        run_starts[1:] = position_ranks[1:] != position_ranks[:-1]
+        boundaries = np.flatnonzero(run_starts).tolist() + [len(position_ranks)]
+
+        extensions = []
+        for begin, end in zip(boundaries[:-1], boundaries[1:]):
+            if end - begin < self.min_frequency:
+                continue
+            extensions.append(
+                (
+                    int(position_ranks[begin]),
+                    starts[occurrences[begin:end]],
+                    positions[begin:end] + 1,
+                )
+            )
+        return extensions
+
+    def generate_motives_with_bitsets(
+        self,
+        sequence: Sequence[int],
+    ) -> List[Motive]:
+        # The occurrences of a motive are stored as packed bitsets over the
+        # voice, one per motive length: bit s of row l is set if the motive
+        # occurs at s with length l. The intervals are stored the same way,
+        # shifted by every possible distance to the start of a motive, so
+        # all extensions of a motive are found by ANDing rows.
+        logging.info("Generating motives with bitsets")
+        codes = np.asarray(sequence, dtype=np.int64)
+        if len(codes) == 0:
+            return []
+        ranks, rank_codes, last_positions = self.rank_intervals(codes)
+        num_ranks = len(rank_codes)
+
+        max_length = max(1, self.max_length)
+        one_hot = ranks[None, :] == np.arange(num_ranks)[:, None]
+        shifted_intervals = np.stack(
+            [
+                np.packbits(np.pad(one_hot[:, shift:], ((0, 0), (0, shift))), axis=1)
+                for shift in range(max_length)
+            ]
+        )
+
+        min_depth = self.min_depth
+        max_depth = self.max_depth
+        levels: List[List[Motive]] = [[] for _ in range(max_depth + 1)]
+
+        counts = np.bincount(ranks, minlength=num_ranks)
+        stack = []
+        for rank in reversed(range(num_ranks)):
+            if counts[rank] >= self.min_frequency and last_positions[rank] >= 0:
+                occurrences = np.zeros(
+                    (max_length + 1, shifted_intervals.shape[2]), dtype=np.uint8
+                )
+                occurrences[1] = shifted_intervals[0, rank]
+                stack.append(((rank_codes[rank],), occurrences))
+
+        while stack:
+            motive_sequence, occurrences = stack.pop()
+            depth = len(motive_sequence)
+            if depth >= min_depth:
+                levels[depth].append(
+                    Motive(
+                        sequence=motive_sequence,
+                        positions=bitset_positions(occurrences),
+                    )
+                )
+            if depth >= max_depth:
+                continue
+            extensions = self.join_bitsets(
+                shifted_intervals, last_positions, occurrences
+            )
+            for rank, extension_occurrences in reversed(extensions):
+                stack.append(
+                    (motive_sequence + (rank_codes[rank],), extension_occurrences)
+                )
+
+        return [motive for level in levels for motive in level]
+
+    def join_bitsets(
+        self,
+        shifted_intervals: np.ndarray,
+        last_positions: np.ndarray,
+        occurrences: np.ndarray,
+    ) -> List[Tuple[int, np.ndarray]]:
+        # Occurrences of length l are extended by an interval d positions
+        # after their end with row l + d of the shifted intervals. Trying the
+        # distances in order and masking the matched starts keeps only the
+        # first match, see join_positions.
+        max_length = len(occurrences) - 1
+        num_ranks = shifted_intervals.shape[1]
+        matched = np.zeros(shifted_intervals.shape[1:], dtype=np.uint8)
+        extensions = np.zeros((num_ranks,) + occurrences.shape, dtype=np.uint8)
+        lengths = np.flatnonzero(occurrences.any(axis=1)).tolist()
+        for length in lengths:
+            for distance in range(self.max_gap + 1):
+                if length + distance + 1 > max_length:
+                    break
+                hits = (
+                    shifted_intervals[length + distance]
+                    & occurrences[length]
+                    & ~matched
+                )
+                extensions[:, length + distance + 1] |= hits
+                matched |= hits
+
+        # Like generate_candidate_extension, only intervals which occur after
+        # the first occurrence are used.
+        first_positions = bitset_positions(occurrences, limit=1)
+        first_end = first_positions[0].position + first_positions[0].length
+        frequencies = np.bitwise_count(extensions).sum(axis=(1, 2), dtype=np.int64)
+        ranks = np.flatnonzero(
+            (frequencies >= self.min_frequency) & (last_positions >= first_end)
+        )
+        return [(rank, extensions[rank]) for rank in ranks.tolist()]
+
+    def rank_intervals(
+        self, codes: np.ndarray
+    ) -> Tuple[np.ndarray, List[int], np.ndarray]:
+        # Ranks the intervals by first appearance and returns the ranks, the
+        # code of every rank and its last position, which limits the
+        # candidates like in generate_candidate_extension. Pruned breaks get
+        # a last position of -1, so they never start or extend a motive.
+        ranks = rank_by_first_appearance(codes)
+        num_ranks = int(ranks.max()) + 1
+        rank_codes = np.empty(num_ranks, dtype=np.int64)
+        rank_codes[ranks] = codes
+        last_positions = np.zeros(num_ranks, dtype=np.int64)
+        np.maximum.at(last_positions, ranks, np.arange(len(ranks)))
+        if self.prune_breaks:
+            last_positions[is_break_code(rank_codes)] = -1
+        return ranks, rank_codes.tolist(), last_positions
+
+    def extendable_lengths(self, codes: np.ndarray) -> np.ndarray:
+        # The maximal number of intervals of a motive starting at every
+        # position: up to the end of the sequence, or up to the next break
+        # if breaks are pruned.
+        positions = np.arange(len(codes))
+        ends = np.full(len(codes), len(codes))
+        if self.prune_breaks:
+            break_positions = np.flatnonzero(is_break_code(codes))
+            ends = np.append(break_positions, len(codes))[
+                np.searchsorted(break_positions, positions)
+            ]
+        return ends - positions
+
+    def remove_infrequent_motives(self, motives: List[Motive]) -> List[Motive]:
+        return [motive for motive in motives if motive.frequency >= self.min_frequency]
+
+    def get_basic_motives(self, sequence: Sequence[int]) -> List[Motive]:
+        logging.info("Getting basic motives")
+        basic_motives: dict[int, Motive] = {}
+        codes = sequence.tolist() if isinstance(sequence, np.ndarray) else sequence
+        for index, code in enumerate(codes):
+            if code not in basic_motives:
+                basic_motives[code] = Motive(sequence=(code,), positions=[])
+            basic_motives[code].positions.append(Occurrence(position=index, length=1))
         logging.info(f"Found {len(basic_motives)} basic motives")
 
         return [motive for motive in basic_motives.values()]
@@ -123,29 +588,45 @@ class MotiveGenerator:
         return motive.positions[0].position + motive.positions[0].length
 
     def generate_candidate_extension(
-        self, base_motives: List[Motive], frequent_position: int
+        self,
+        motive: Motive,
+        base_motives: List[Motive],
+        base_motive_index: np.ndarray,
     ) -> List[Motive]:
+        # Only base motives occurring in the window after an occurrence of
+        # the motive can extend it. base_motive_index maps every position of
+        # the sequence to its base motive, or -1 if it is none.
+        frequent_position = self.get_frequent_position(motive)
         logging.info(
             f"Generating candidate extensions for position {frequent_position}"
         )
+        starts = position_starts(motive)
+        ends = starts + np.fromiter(
+            (position.length for position in motive.positions),
+            dtype=np.int64,
+            count=len(motive.positions),
+        )
+        _, positions = self.extension_windows(starts, ends, len(base_motive_index))
+        indices = np.unique(base_motive_index[positions])
         return [
-            motive
-            for motive in base_motives
-            if any(pos.position >= frequent_position for pos in motive.positions)
+            base_motives[index]
+            for index in indices[indices >= 0].tolist()
+            if base_motives[index].positions[-1].position >= frequent_position
         ]
 
-    def merge_motives(self, motive: Motive, candidate: Motive) -> Optional[Motive]:
+    def merge_motives(
+        self,
+        motive: Motive,
+        candidate: Motive,
+        candidate_starts: Optional[np.ndarray] = None,
+    ) -> Optional[Motive]:
         logging.info(f"Merging motives {motive.sequence} and {candidate.sequence}")
         logging.info(f"Number of positions in motive: {len(motive.positions)}")
         logging.info(f"Number of positions in candidate: {len(candidate.positions)}")
 
-        with ThreadPoolExecutor() as executor:
-            results = executor.map(
-                lambda p: self.process_positions(p, candidate.positions),
-                motive.positions,
-            )
-
-        new_positions = [result for result in results if result is not None]
+        if candidate_starts is None:
+            candidate_starts = position_starts(candidate)
+        new_positions = self.join_positions(motive.positions, candidate_starts)
 
         if new_positions:
             position_sequence = PositionSequence(new_positions)
@@ -156,36 +637,61 @@ class MotiveGenerator:
             )
         return None
 
-    def process_positions(
+    def join_positions(
         self,
-        position: MotivePosition,
-        candidate_positions: list[MotivePosition],
-    ):
-        next_positions = []
-        for candidate_position in candidate_positions:
-            gap = candidate_position.position - (position.position + position.length)
-            if gap > self.max_gap:
-                continue
+        positions: List[Occurrence],
+        candidate_starts: np.ndarray,
+    ) -> List[Occurrence]:
+        # Extends every position with the first candidate that starts after
+        # its end, at most max_gap later and within max_length. Candidates
+        # are basic motives, so each of them is one interval long and their
+        # starts are sorted.
+        if len(positions) == 0 or len(candidate_starts) == 0:
+            return []
+
+        starts = np.fromiter(
+            (position.position for position in positions),
+            dtype=np.int64,
+            count=len(positions),
+        )
+        ends = starts + np.fromiter(
+            (position.length for position in positions),
+            dtype=np.int64,
+            count=len(positions),
+        )
+
+        indices = np.searchsorted(candidate_starts, ends, side="left")
+        found = indices < len(candidate_starts)
+        next_starts = candidate_starts[np.minimum(indices, len(candidate_starts) - 1)]
+        limits = np.minimum(ends + self.max_gap, starts + self.max_length - 1)
+        found &= next_starts <= limits
 
-            starts_after_current_end = candidate_position.position >= (
-                position.position + position.length
+        return [
+            Occurrence(position=start, length=next_start - start + 1)
+            for start, next_start in zip(
+                starts[found].tolist(), next_starts[found].tolist()
             )
-            if not starts_after_current_end:
-                continue
+        ]
 
-            total_length = (
-                candidate_position.position + candidate_position.length
-            ) - position.position
-            if total_length > self.max_length:
-                continue
 
-            next_positions.append(candidate_position)
+def bitset_positions(
+    occurrences: np.ndarray, limit: Optional[int] = None
+) -> List[Occurrence]:
+    # Only the bytes with set bits are unpacked. Unpacking them as
+    # (byte, bit, length) returns the positions ordered by their start.
+    columns = np.flatnonzero(occurrences.any(axis=0))[:limit]
+    bits = np.unpackbits(occurrences[:, columns].T[:, None, :], axis=1)
+    indices, offsets, lengths = np.nonzero(bits)
+    starts = columns[indices] * 8 + offsets
+    return [
+        Occurrence(position=start, length=length)
+        for start, length in zip(starts[:limit].tolist(), lengths[:limit].tolist())
+    ]
 
-        if next_positions:
-            return MotivePosition(
-                position=position.position,
-                length=(next_positions[0].position - position.position)
-                + next_positions[0].length,
-            )
 
-        return None
+def position_starts(motive: Motive) -> np.ndarray:
+    return np.fromiter(
+        (position.position for position in motive.positions),
+        dtype=np.int64,
+        count=len(motive.positions),
+    )
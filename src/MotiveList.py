@@ -1,12 +1,15 @@
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, field_serializer
 
 from GeneralInterval import IntervalList
 from Motive import Motive
 from MotivePosition import MotivePosition
+from OccurrenceTable import OccurrenceTable
+from Orbit import Orbit
 from SequenceType import SequenceType
+from StringTable import StringTable
 
 
 class IntervalClasses(BaseModel):
@@ -38,13 +41,19 @@ class IntervalClasses(BaseModel):
                 return sequence_type
         return None
 
+    def codes(self) -> Dict[SequenceType, Tuple[int, ...]]:
+        return {
+            sequence_type: interval_class.codes()
+            for sequence_type, interval_class in self.interval_classes.items()
+        }
+
     def name(self, sequence_type: SequenceType) -> str:
         return str(self.interval_classes[sequence_type])
 
 
-def _default_positions() -> Dict[
-    SequenceType, Dict[str, Dict[str, Dict[str, List[MotivePosition]]]]
-]:
+def _default_positions() -> (
+    Dict[SequenceType, Dict[str, Dict[str, Dict[str, List[MotivePosition]]]]]
+):
     return {
         SequenceType.ORIGINAL: {},
         SequenceType.INVERTED: {},
@@ -58,10 +67,59 @@ class ResultMotive(BaseModel):
     positions: Dict[
         SequenceType, Dict[str, Dict[str, Dict[str, List[MotivePosition]]]]
     ] = Field(default_factory=_default_positions)
+    _codes: Optional[Dict[SequenceType, Tuple[int, ...]]] = PrivateAttr(default=None)
+    _orbit: Optional[Orbit] = PrivateAttr(default=None)
+    # With an occurrence table the positions are added to it instead, and
+    # positions stays empty. Use nested_positions to read them.
+    _occurrences: Optional[OccurrenceTable] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_codes(
+        cls, codes: Tuple[int, ...], strings: Optional[StringTable] = None
+    ) -> "ResultMotive":
+        result_motive = cls(
+            intervals=IntervalClasses.from_intervals(IntervalList.from_codes(codes))
+        )
+        result_motive._set_codes(tuple(codes))
+        if strings is not None:
+            result_motive._occurrences = OccurrenceTable(strings)
+        return result_motive
 
-    def get_sequence_type(self, motive: Motive) -> Optional[SequenceType]:
-        interval_list = IntervalList(intervals=motive.sequence)
-        return self.intervals.get_sequence_type(interval_list)
+    def _set_codes(self, codes: Tuple[int, ...]):
+        self._codes = {
+            sequence_type: sequence_type.apply(codes) for sequence_type in SequenceType
+        }
+        self._orbit = Orbit.from_codes(codes)
+
+    def codes(self) -> Dict[SequenceType, Tuple[int, ...]]:
+        if self._codes is None:
+            self._set_codes(
+                self.intervals.interval_classes[SequenceType.ORIGINAL].codes()
+            )
+            # Read motives may have their interval classes reordered, their
+            # orbit does not describe them then.
+            codes = self.intervals.codes()
+            if codes != self._codes:
+                self._codes = codes
+                self._orbit = None
+        return self._codes
+
+    def orbit(self) -> Optional[Orbit]:
+        self.codes()
+        return self._orbit
+
+    def get_sequence_type(
+        self, motive: Motive, orbit: Optional[Orbit] = None
+    ) -> Optional[SequenceType]:
+        codes = self.codes()
+        if orbit is None:
+            orbit = motive.orbit
+        if orbit is not None and self._orbit is not None:
+            return self._orbit.get_sequence_type(orbit)
+        for sequence_type, sequence_codes in codes.items():
+            if sequence_codes == motive.sequence:
+                return sequence_type
+        return None
 
     def add(
         self,
@@ -71,11 +129,58 @@ class ResultMotive(BaseModel):
         part_id: str,
         voice_id: str,
     ):
+        if self._occurrences is not None:
+            self._occurrences.add(
+                sequence_type, piece_title, part_id, voice_id, motive.positions
+            )
+            return
         self.positions[sequence_type].setdefault(piece_title, {}).setdefault(
             part_id, {}
-        ).setdefault(voice_id, []).extend(motive.positions)
+        ).setdefault(voice_id, []).extend(
+            MotivePosition.model_construct(
+                position=occurrence.position, length=occurrence.length
+            )
+            for occurrence in motive.positions
+        )
+
+    def nested_positions(
+        self,
+    ) -> Dict[SequenceType, Dict[str, Dict[str, Dict[str, List[MotivePosition]]]]]:
+        if self._occurrences is not None:
+            return self._occurrences.nested()
+        return self.positions
+
+    def position_rows(self) -> Iterator[Tuple[SequenceType, str, str, str, int, int]]:
+        # The sequence type, piece title, part id, voice id, position and
+        # length of every position. Building the nested positions from the
+        # rows in this order gives the same nested positions, apart from
+        # empty lists.
+        if self._occurrences is not None:
+            yield from self._occurrences.rows()
+            return
+        for sequence_type, sequence_type_positions in self.positions.items():
+            for piece_title, piece_positions in sequence_type_positions.items():
+                for part_id, part_positions in piece_positions.items():
+                    for voice_id, voice_positions in part_positions.items():
+                        for position in voice_positions:
+                            yield (
+                                sequence_type,
+                                piece_title,
+                                part_id,
+                                voice_id,
+                                position.position,
+                                position.length,
+                            )
+
+    @field_serializer("positions", mode="wrap")
+    def serialize_positions(self, positions, handler):
+        if self._occurrences is not None:
+            positions = self._occurrences.nested()
+        return handler(positions)
 
     def frequency(self, sequence_type: Optional[SequenceType] = None) -> int:
+        if self._occurrences is not None:
+            return self._occurrences.frequency(sequence_type)
         if sequence_type is None:
             return count_elements_in_lists(self.positions)
         return count_elements_in_lists(self.positions[sequence_type])
@@ -91,6 +196,21 @@ def count_elements_in_lists(d: Any) -> int:
 
 class MotiveList(BaseModel):
     motives: List[ResultMotive]
+    # Positions of the motives in motives by the representative of their
+    # orbit. Motives without an orbit are stored by all their sequence types.
+    _orbits: Dict[Tuple[int, ...], int] = PrivateAttr(default_factory=dict)
+    _sequences: Dict[Tuple[int, ...], Tuple[int, SequenceType]] = PrivateAttr(
+        default_factory=dict
+    )
+    _num_indexed: int = PrivateAttr(default=0)
+    # Set for lists storing the positions of new motives in occurrence tables.
+    _strings: Optional[StringTable] = PrivateAttr(default=None)
+
+    @classmethod
+    def columnar(cls) -> "MotiveList":
+        motive_list = cls(motives=[])
+        motive_list._strings = StringTable()
+        return motive_list
 
     def add(
         self,
@@ -101,53 +221,65 @@ class MotiveList(BaseModel):
     ):
         logging.info(f"Adding {len(candidate_motives)} candidate motives")
         for candidate_motive in candidate_motives:
-            if len(self.motives) == 0:
-                result_motive = ResultMotive(
-                    intervals=IntervalClasses.from_intervals(
-                        IntervalList(intervals=candidate_motive.sequence)
-                    )
-                )
-                result_motive.add(
+            orbit = candidate_motive.orbit or Orbit.from_codes(
+                candidate_motive.sequence
+            )
+            existing = self.find(candidate_motive, orbit)
+
+            if existing is not None:
+                existing_motive, sequence_type = existing
+                existing_motive.add(
                     candidate_motive,
-                    SequenceType.ORIGINAL,
+                    sequence_type,
                     piece_title,
                     part_id,
                     voice_id,
                 )
-
-                self.motives.append(result_motive)
                 continue
 
-            found_existing_motive = False
-            for existing_motive in self.motives:
-                sequence_type = existing_motive.get_sequence_type(candidate_motive)
-
-                if sequence_type is not None:
-                    existing_motive.add(
-                        candidate_motive,
-                        sequence_type,
-                        piece_title,
-                        part_id,
-                        voice_id,
-                    )
-                    found_existing_motive = True
-                    break
-
-            if not found_existing_motive:
-                result_motive = ResultMotive(
-                    intervals=IntervalClasses.from_intervals(
-                        IntervalList(intervals=candidate_motive.sequence)
-                    )
-                )
-                result_motive.add(
-                    candidate_motive,
-                    SequenceType.ORIGINAL,
-                    piece_title,
-                    part_id,
-                    voice_id,
-                )
+            result_motive = ResultMotive.from_codes(
+                candidate_motive.sequence, self._strings
+            )
+            result_motive.add(
+                candidate_motive,
+                SequenceType.ORIGINAL,
+                piece_title,
+                part_id,
+                voice_id,
+            )
+
+            self.motives.append(result_motive)
 
-                self.motives.append(result_motive)
+    def find(
+        self, motive: Motive, orbit: Optional[Orbit] = None
+    ) -> Optional[Tuple[ResultMotive, SequenceType]]:
+        # The first motive containing the sequence of motive as one of its
+        # sequence types.
+        self._index_motives()
+        matches = []
+        if orbit is not None and orbit.representative in self._orbits:
+            index = self._orbits[orbit.representative]
+            matches.append(
+                (index, self.motives[index].get_sequence_type(motive, orbit))
+            )
+        if motive.sequence in self._sequences:
+            matches.append(self._sequences[motive.sequence])
+
+        if not matches:
+            return None
+        index, sequence_type = min(matches, key=lambda match: match[0])
+        return self.motives[index], sequence_type
+
+    def _index_motives(self):
+        for index in range(self._num_indexed, len(self.motives)):
+            result_motive = self.motives[index]
+            orbit = result_motive.orbit()
+            if orbit is not None:
+                self._orbits.setdefault(orbit.representative, index)
+                continue
+            for sequence_type, codes in result_motive.codes().items():
+                self._sequences.setdefault(codes, (index, sequence_type))
+        self._num_indexed = len(self.motives)
 
     def __len__(self):
         return len(self.motives)
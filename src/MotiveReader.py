@@ -0,0 +1,155 @@
+import io
+import json
+import re
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+import numpy as np
+
+from GeneralInterval import IntervalList
+from MotiveList import IntervalClasses, MotiveList, ResultMotive
+from MotivePosition import MotivePosition
+from OutputCompression import OutputCompression
+from SequenceType import SequenceType
+
+_CHUNK_SIZE = 1 << 20
+_WHITESPACE = re.compile(r"\s*")
+_DECODER = json.JSONDecoder()
+
+
+def read_motives_from_json_file(path: Path) -> MotiveList:
+    return MotiveList(motives=list(iterate_motives_from_json_file(path)))
+
+
+def iterate_motives_from_file(path: Path) -> Iterator[ResultMotive]:
+    if path.suffix == ".npz":
+        return iterate_motives_from_npz_file(path)
+    return iterate_motives_from_json_file(path)
+
+
+def iterate_motives_from_npz_file(path: Path) -> Iterator[ResultMotive]:
+    # Reads a file written by MotiveWriter.write_motives_as_npz. The columns
+    # are only loaded from the file when they are used.
+    with np.load(path) as data:
+        sequence_types = [SequenceType[name] for name in data["sequence_types"]]
+        strings = data["strings"].tolist()
+        codes = data["codes"]
+        code_offsets = data["code_offsets"].tolist()
+        occurrence_motive = data["occurrence_motive"]
+        occurrence_columns = [
+            data[name]
+            for name in (
+                "occurrence_sequence_type",
+                "occurrence_piece",
+                "occurrence_part",
+                "occurrence_voice",
+                "occurrence_position",
+                "occurrence_length",
+            )
+        ]
+        # The positions are sorted by their motive.
+        boundaries = np.searchsorted(
+            occurrence_motive, np.arange(len(code_offsets))
+        ).tolist()
+
+        for motive_id in range(len(code_offsets) - 1):
+            motive_codes = codes[code_offsets[motive_id] : code_offsets[motive_id + 1]]
+            intervals = IntervalClasses(
+                interval_classes={
+                    sequence_type: IntervalList.from_codes(
+                        motive_codes[:, index].tolist()
+                    )
+                    for index, sequence_type in enumerate(sequence_types)
+                }
+            )
+
+            positions = {sequence_type: {} for sequence_type in sequence_types}
+            rows = slice(boundaries[motive_id], boundaries[motive_id + 1])
+            for sequence_type_id, piece_id, part_id, voice_id, position, length in zip(
+                *(column[rows].tolist() for column in occurrence_columns)
+            ):
+                positions[sequence_types[sequence_type_id]].setdefault(
+                    strings[piece_id], {}
+                ).setdefault(strings[part_id], {}).setdefault(
+                    strings[voice_id], []
+                ).append(
+                    MotivePosition(position=position, length=length)
+                )
+
+            yield ResultMotive(intervals=intervals, positions=positions)
+
+
+def iterate_motives_from_json_file(path: Path) -> Iterator[ResultMotive]:
+    # Reads the motives of a file written by MotiveWriter one at a time. The
+    # compression is determined by the suffix of the file.
+    compression = OutputCompression.from_path(path)
+    with io.TextIOWrapper(compression.open_for_reading(path), encoding="utf-8") as file:
+        for data in iterate_json_array(file, "motives"):
+            yield ResultMotive.model_validate(data)
+
+
+def iterate_json_array(file: TextIO, key: str) -> Iterator[Any]:
+    # Yields the elements of the array at key of the top level object.
+    stream = _JsonStream(file)
+    stream.expect("{")
+    while stream.decode() != key:
+        stream.expect(":")
+        stream.decode()
+        stream.expect(",")
+    stream.expect(":")
+    stream.expect("[")
+    if stream.peek() == "]":
+        return
+    while True:
+        yield stream.decode()
+        if stream.expect(",]") == "]":
+            return
+
+
+class _JsonStream:
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.buffer = ""
+        self.index = 0
+
+    def read(self, size: int = 0) -> bool:
+        chunk = self.file.read(max(size, _CHUNK_SIZE))
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.index :] + chunk
+        self.index = 0
+        return True
+
+    def peek(self) -> str:
+        # The next character that is not whitespace, "" at the end of the file.
+        while True:
+            self.index = _WHITESPACE.match(self.buffer, self.index).end()
+            if self.index < len(self.buffer):
+                return self.buffer[self.index]
+            if not self.read():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        character = self.peek()
+        if character == "" or character not in characters:
+            raise ValueError(
+                f"Expected one of {characters!r} but found {character!r} in JSON"
+            )
+        self.index += 1
+        return character
+
+    def decode(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.index)
+            except json.JSONDecodeError:
+                # The value may continue in the next chunks. The buffer is
+                # doubled, so long values are not decoded too often.
+                if self.read(len(self.buffer) - self.index):
+                    continue
+                raise
+            if end == len(self.buffer) and self.read():
+                continue
+            self.index = end
+            return value
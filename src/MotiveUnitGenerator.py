@@ -1,81 +1,60 @@
 import logging
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import Dict, Tuple
 
-from music21 import note
-from music21.interval import Interval as m21Interval
+import numpy as np
 
 from Corpus import Corpus
-from GeneralInterval import Interval, RestIntervalType, BreakInterval
-from Motive import Motive
-from MotivePosition import MotivePosition
-from Voice import Voice
+from EncodedVoice import EncodedVoice, REST
+from GeneralInterval import RestIntervalType, BREAK_CODE_OFFSET
+
+NO_BREAK = -1
 
 
 @dataclass
 class MotiveUnitGenerator:
     @staticmethod
-    def from_corpus(corpus: Corpus) -> Dict[str, Dict[str, Dict[str, list[Motive]]]]:
+    def from_corpus(
+        corpus: Corpus,
+    ) -> Dict[str, Dict[str, Dict[str, np.ndarray]]]:
         logging.info("Generating motive units from corpus")
-        motive_units: Dict[str, Dict[str, Dict[str, list[Motive]]]] = {}
+        motive_units: Dict[str, Dict[str, Dict[str, np.ndarray]]] = {}
         for piece in corpus.pieces:
             motive_units[piece.title] = {}
             for part in piece.parts:
                 motive_units[piece.title][part.id] = {}
-                for voice in part.voices:
+                for voice in part.encode().voices:
                     motive_units[piece.title][part.id][voice.id] = (
-                        MotiveUnitGenerator.original_from_voice(voice)
+                        MotiveUnitGenerator.original_from_encoded_voice(voice)
                     )
 
         return motive_units
 
     @staticmethod
-    def original_from_voice(voice: Voice) -> List[Motive]:
-        single_motives: List[Motive] = []
+    def original_from_encoded_voice(voice: EncodedVoice) -> np.ndarray:
+        intervals, break_types = encode_intervals(voice)
 
-        for i, note_or_rest in enumerate(voice.notes):
-            if i == len(voice.notes) - 1:
-                break
+        is_break = break_types != NO_BREAK
+        codes = intervals.astype(np.int16)
+        codes[is_break] = BREAK_CODE_OFFSET + break_types[is_break].astype(np.int16)
+        return codes
 
-            position = MotivePosition(
-                position=i,
-                length=1,
-            )
 
-            if isinstance(note_or_rest, note.Note):
-                if isinstance(voice.notes[i + 1], note.Note):
-                    m21_interval = m21Interval(
-                        note_or_rest, voice.notes[i + 1]
-                    ).generic.directed
-                    sequence = [Interval(interval=m21_interval)]
+def encode_intervals(voice: EncodedVoice) -> Tuple[np.ndarray, np.ndarray]:
+    numbers = np.frombuffer(voice.diatonic_note_numbers, dtype=np.int16).astype(
+        np.int32
+    )
+    is_rest = numbers == REST
+    rest_before, rest_after = is_rest[:-1], is_rest[1:]
 
-                    single_motives.append(
-                        Motive(
-                            sequence=sequence,
-                            positions=[position],
-                        )
-                    )
-                else:
-                    sequence = [BreakInterval(type=RestIntervalType.NOTE_BEFORE)]
-                    single_motives.append(
-                        Motive(
-                            sequence=sequence,
-                            positions=[position],
-                        )
-                    )
-            else:
-                if isinstance(voice.notes[i + 1], note.Note):
-                    sequence = [BreakInterval(type=RestIntervalType.NOTE_AFTER)]
-                    single_motives.append(
-                        Motive(
-                            sequence=sequence,
-                            positions=[position],
-                        )
-                    )
-                else:
-                    sequence = [BreakInterval(type=RestIntervalType.REST_BEFORE)]
-                    single_motives.append(
-                        Motive(sequence=sequence, positions=[position])
-                    )
+    # Directed generic intervals: a unison is 1, a step up 2, a step down -2.
+    staff_distances = np.diff(numbers)
+    intervals = staff_distances + np.sign(staff_distances)
+    intervals[staff_distances == 0] = 1
+
+    break_types = np.full(len(staff_distances), NO_BREAK, dtype=np.int8)
+    break_types[~rest_before & rest_after] = RestIntervalType.NOTE_BEFORE
+    break_types[rest_before & ~rest_after] = RestIntervalType.NOTE_AFTER
+    break_types[rest_before & rest_after] = RestIntervalType.REST_BEFORE
 
-        return single_motives
+    return intervals, break_types
@@ -1,15 +1,316 @@
+import io
+import sqlite3
+from array import array
 from pathlib import Path
+from typing import TextIO
+
+import numpy as np
 
 from MotiveList import MotiveList
+from OutputCompression import OutputCompression
+from SequenceType import SequenceType
+from StringTable import StringTable
 
 
-def write_motives_as_json_to_file(motives: MotiveList, output_folder: Path):
+def write_motives_as_json_to_file(
+    motives: MotiveList,
+    output_folder: Path,
+    compression: OutputCompression = OutputCompression.NONE,
+    pretty: bool = True,
+) -> Path:
     if not output_folder.exists():
         output_folder.mkdir()
 
-    with open(output_folder / output_json_filename, "w") as file:
-        file.write(motives.model_dump_json(indent=2))
+    path = output_folder / (output_json_filename + compression.suffix)
+    with io.TextIOWrapper(compression.open(path), encoding="utf-8") as file:
+        write_motives_as_json(motives, file, pretty)
+    return path
+
+
+def write_motives_as_json(motives: MotiveList, file: TextIO, pretty: bool = True):
+    # Writes the same JSON as motives.model_dump_json, with pretty as
+    # model_dump_json(indent=2), but one motive at a time.
+    if not pretty:
+        file.write('{"motives":[')
+        for index, motive in enumerate(motives):
+            if index > 0:
+                file.write(",")
+            file.write(motive.model_dump_json())
+        file.write("]}")
+        return
+
+    if len(motives) == 0:
+        file.write('{\n  "motives": []\n}')
+        return
+
+    file.write('{\n  "motives": [\n')
+    for index, motive in enumerate(motives):
+        if index > 0:
+            file.write(",\n")
+        file.write("    ")
+        file.write(motive.model_dump_json(indent=2).replace("\n", "\n    "))
+    file.write("\n  ]\n}")
+
+
+def write_motives_as_npz_to_file(
+    motives: MotiveList,
+    output_folder: Path,
+    compression: OutputCompression = OutputCompression.NONE,
+) -> Path:
+    # A table of the motives and a table of all their positions, see
+    # write_motives_as_npz.
+    if compression is OutputCompression.ZSTD:
+        raise ValueError("NPZ output only supports GZIP compression")
+    if not output_folder.exists():
+        output_folder.mkdir()
+
+    path = output_folder / output_npz_filename
+    with open(path, "wb") as file:
+        write_motives_as_npz(motives, file, compression is OutputCompression.GZIP)
+    return path
+
+
+def write_motives_as_npz(motives: MotiveList, file, compressed: bool = False):
+    # Motive i has the intervals codes[code_offsets[i]:code_offsets[i + 1]],
+    # one column per sequence type, and the positions with occurrence_motive
+    # i. Pieces, parts and voices of the positions are indices into strings.
+    sequence_types = tuple(SequenceType)
+    sequence_type_ids = {
+        sequence_type: sequence_type_id
+        for sequence_type_id, sequence_type in enumerate(sequence_types)
+    }
+    strings = StringTable()
+    codes = []
+    code_offsets = [0]
+    names = []
+    frequencies = []
+    occurrence_motive = array("i")
+    occurrence_sequence_type = array("b")
+    occurrence_piece = array("i")
+    occurrence_part = array("i")
+    occurrence_voice = array("i")
+    occurrence_position = array("i")
+    occurrence_length = array("i")
+
+    for motive_id, motive in enumerate(motives):
+        motive_codes = motive.codes()
+        codes.extend(
+            zip(*(motive_codes[sequence_type] for sequence_type in sequence_types))
+        )
+        code_offsets.append(len(codes))
+        names.append(
+            [motive.intervals.name(sequence_type) for sequence_type in sequence_types]
+        )
+        frequencies.append(
+            [motive.frequency(sequence_type) for sequence_type in sequence_types]
+        )
+
+        for (
+            sequence_type,
+            piece_title,
+            part_id,
+            voice_id,
+            position,
+            length,
+        ) in motive.position_rows():
+            occurrence_motive.append(motive_id)
+            occurrence_sequence_type.append(sequence_type_ids[sequence_type])
+            occurrence_piece.append(strings.intern(piece_title))
+            occurrence_part.append(strings.intern(part_id))
+            occurrence_voice.append(strings.intern(voice_id))
+            occurrence_position.append(position)
+            occurrence_length.append(length)
+
+    save = np.savez_compressed if compressed else np.savez
+    save(
+        file,
+        sequence_types=np.array(
+            [str(sequence_type) for sequence_type in sequence_types]
+        ),
+        strings=np.array(strings.strings, dtype=str),
+        codes=np.array(codes, dtype=np.int16).reshape(-1, len(sequence_types)),
+        code_offsets=np.array(code_offsets, dtype=np.int64),
+        names=np.array(names, dtype=str).reshape(-1, len(sequence_types)),
+        frequencies=np.array(frequencies, dtype=np.int64).reshape(
+            -1, len(sequence_types)
+        ),
+        occurrence_motive=np.frombuffer(occurrence_motive, dtype=np.int32),
+        occurrence_sequence_type=np.frombuffer(occurrence_sequence_type, dtype=np.int8),
+        occurrence_piece=np.frombuffer(occurrence_piece, dtype=np.int32),
+        occurrence_part=np.frombuffer(occurrence_part, dtype=np.int32),
+        occurrence_voice=np.frombuffer(occurrence_voice, dtype=np.int32),
+        occurrence_position=np.frombuffer(occurrence_position, dtype=np.int32),
+        occurrence_length=np.frombuffer(occurrence_length, dtype=np.int32),
+    )
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE sequence_types (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE pieces (id INTEGER PRIMARY KEY, title TEXT NOT NULL);
+CREATE TABLE parts (
+    id INTEGER PRIMARY KEY,
+    piece_id INTEGER NOT NULL REFERENCES pieces (id),
+    name TEXT NOT NULL
+);
+CREATE TABLE voices (
+    id INTEGER PRIMARY KEY,
+    part_id INTEGER NOT NULL REFERENCES parts (id),
+    name TEXT NOT NULL
+);
+CREATE TABLE motives (
+    id INTEGER PRIMARY KEY,
+    frequency INTEGER NOT NULL,
+    frequency_original INTEGER NOT NULL,
+    frequency_inverted INTEGER NOT NULL,
+    frequency_mirrored INTEGER NOT NULL,
+    frequency_mirrored_inverted INTEGER NOT NULL
+);
+CREATE TABLE motive_intervals (
+    motive_id INTEGER NOT NULL REFERENCES motives (id),
+    sequence_type_id INTEGER NOT NULL REFERENCES sequence_types (id),
+    intervals TEXT NOT NULL
+);
+CREATE TABLE occurrences (
+    motive_id INTEGER NOT NULL REFERENCES motives (id),
+    sequence_type_id INTEGER NOT NULL REFERENCES sequence_types (id),
+    voice_id INTEGER NOT NULL REFERENCES voices (id),
+    position INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+"""
+
+# Created after inserting, which is much faster than updating them on every
+# insert.
+_SQLITE_INDEXES = """
+CREATE INDEX motive_intervals_intervals ON motive_intervals (intervals);
+CREATE INDEX motive_intervals_motive ON motive_intervals (motive_id);
+CREATE INDEX motives_frequency ON motives (frequency);
+CREATE INDEX pieces_title ON pieces (title);
+CREATE INDEX parts_piece ON parts (piece_id, name);
+CREATE INDEX voices_part ON voices (part_id);
+CREATE INDEX occurrences_motive ON occurrences (motive_id, sequence_type_id);
+CREATE INDEX occurrences_voice ON occurrences (voice_id, motive_id);
+ANALYZE;
+"""
+
+
+def write_motives_as_sqlite_to_file(
+    motives: MotiveList,
+    output_folder: Path,
+    compression: OutputCompression = OutputCompression.NONE,
+) -> Path:
+    if compression is not OutputCompression.NONE:
+        raise ValueError("SQLite output does not support compression")
+    if not output_folder.exists():
+        output_folder.mkdir()
+
+    path = output_folder / output_sqlite_filename
+    path.unlink(missing_ok=True)
+    connection = sqlite3.connect(path)
+    try:
+        write_motives_as_sqlite(motives, connection)
+    finally:
+        connection.close()
+    return path
+
+
+def write_motives_as_sqlite(motives: MotiveList, connection: sqlite3.Connection):
+    # Motives have the same ids as their index in motives. All rows are
+    # inserted in a single transaction, the indexes are created afterwards.
+    sequence_types = tuple(SequenceType)
+    sequence_type_ids = {
+        sequence_type: sequence_type_id
+        for sequence_type_id, sequence_type in enumerate(sequence_types)
+    }
+    pieces = {}
+    parts = {}
+    voices = {}
+
+    def voice_row_id(piece_title: str, part_id: str, voice_id: str) -> int:
+        voice_key = (piece_title, part_id, voice_id)
+        if voice_key not in voices:
+            pieces.setdefault(piece_title, len(pieces))
+            parts.setdefault((piece_title, part_id), len(parts))
+            voices[voice_key] = len(voices)
+        return voices[voice_key]
+
+    connection.execute("PRAGMA journal_mode = OFF")
+    connection.execute("PRAGMA synchronous = OFF")
+    connection.executescript(_SQLITE_SCHEMA)
+    with connection:
+        connection.executemany(
+            "INSERT INTO sequence_types VALUES (?, ?)",
+            [
+                (sequence_type_id, str(sequence_type))
+                for sequence_type, sequence_type_id in sequence_type_ids.items()
+            ],
+        )
+
+        for motive_id, motive in enumerate(motives):
+            connection.execute(
+                "INSERT INTO motives VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    motive_id,
+                    motive.frequency(),
+                    *(
+                        motive.frequency(sequence_type)
+                        for sequence_type in sequence_types
+                    ),
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO motive_intervals VALUES (?, ?, ?)",
+                [
+                    (motive_id, sequence_type_id, motive.intervals.name(sequence_type))
+                    for sequence_type, sequence_type_id in sequence_type_ids.items()
+                ],
+            )
+            connection.executemany(
+                "INSERT INTO occurrences VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        motive_id,
+                        sequence_type_ids[sequence_type],
+                        voice_row_id(piece_title, part_id, voice_id),
+                        position,
+                        length,
+                    )
+                    for (
+                        sequence_type,
+                        piece_title,
+                        part_id,
+                        voice_id,
+                        position,
+                        length,
+                    ) in motive.position_rows()
+                ],
+            )
+
+        connection.executemany(
+            "INSERT INTO pieces VALUES (?, ?)",
+            [
+                (piece_row_id, piece_title)
+                for piece_title, piece_row_id in pieces.items()
+            ],
+        )
+        connection.executemany(
+            "INSERT INTO parts VALUES (?, ?, ?)",
+            [
+                (part_row_id, pieces[piece_title], part_id)
+                for (piece_title, part_id), part_row_id in parts.items()
+            ],
+        )
+        connection.executemany(
+            "INSERT INTO voices VALUES (?, ?, ?)",
+            [
+                (voice_row_id, parts[(piece_title, part_id)], voice_id)
+                for (piece_title, part_id, voice_id), voice_row_id in voices.items()
+            ],
+        )
+    connection.executescript(_SQLITE_INDEXES)
 
 
 output_filename = "output.csv"
 output_json_filename = "output.json"
+output_npz_filename = "output.npz"
+output_sqlite_filename = "output.sqlite"
@@ -0,0 +1,14 @@
+from typing import NamedTuple
+
+
+class Occurrence(NamedTuple):
+    # A position of a motive while generating motives. Converted to a
+    # MotivePosition when added to a MotiveList.
+    position: int
+    length: int
+
+    def __str__(self) -> str:
+        return f"{self.position}:{self.length}"
+
+    def __repr__(self) -> str:
+        return f"{self.position}:{self.length}"
@@ -0,0 +1,96 @@
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from MotivePosition import MotivePosition
+from Occurrence import Occurrence
+from SequenceType import SequenceType
+from StringTable import StringTable
+
+_SEQUENCE_TYPES = tuple(SequenceType)
+_SEQUENCE_TYPE_IDS = {
+    sequence_type: sequence_type_id
+    for sequence_type_id, sequence_type in enumerate(_SEQUENCE_TYPES)
+}
+
+
+class OccurrenceTable:
+    # The positions of a result motive as parallel columns, one row per
+    # position. Piece titles, part and voice ids are stored in a string table
+    # shared by all motives of a list.
+    def __init__(self, strings: StringTable):
+        self.strings = strings
+        self.sequence_types = array("b")
+        self.piece_ids = array("i")
+        self.part_ids = array("i")
+        self.voice_ids = array("i")
+        self.positions = array("i")
+        self.lengths = array("i")
+        self.frequencies = [0] * len(_SEQUENCE_TYPES)
+
+    def add(
+        self,
+        sequence_type: SequenceType,
+        piece_title: str,
+        part_id: str,
+        voice_id: str,
+        positions: List[Occurrence],
+    ):
+        count = len(positions)
+        sequence_type_id = _SEQUENCE_TYPE_IDS[sequence_type]
+        self.sequence_types.extend([sequence_type_id] * count)
+        self.piece_ids.extend([self.strings.intern(piece_title)] * count)
+        self.part_ids.extend([self.strings.intern(part_id)] * count)
+        self.voice_ids.extend([self.strings.intern(voice_id)] * count)
+        self.positions.extend(position.position for position in positions)
+        self.lengths.extend(position.length for position in positions)
+        self.frequencies[sequence_type_id] += count
+
+    def frequency(self, sequence_type: Optional[SequenceType] = None) -> int:
+        if sequence_type is None:
+            return len(self.positions)
+        return self.frequencies[_SEQUENCE_TYPE_IDS[sequence_type]]
+
+    def nested(
+        self,
+    ) -> Dict[SequenceType, Dict[str, Dict[str, Dict[str, List[MotivePosition]]]]]:
+        # Rows are visited in the order they were added, so the pieces, parts
+        # and voices are in the same order as if they were added to the
+        # nested positions directly.
+        nested = {sequence_type: {} for sequence_type in _SEQUENCE_TYPES}
+        strings = self.strings.strings
+        for sequence_type_id, piece_id, part_id, voice_id, position, length in zip(
+            self.sequence_types,
+            self.piece_ids,
+            self.part_ids,
+            self.voice_ids,
+            self.positions,
+            self.lengths,
+        ):
+            nested[_SEQUENCE_TYPES[sequence_type_id]].setdefault(
+                strings[piece_id], {}
+            ).setdefault(strings[part_id], {}).setdefault(strings[voice_id], []).append(
+                MotivePosition(position=position, length=length)
+            )
+        return nested
+
+    def rows(self) -> Iterator[Tuple[SequenceType, str, str, str, int, int]]:
+        strings = self.strings.strings
+        for sequence_type_id, piece_id, part_id, voice_id, position, length in zip(
+            self.sequence_types,
+            self.piece_ids,
+            self.part_ids,
+            self.voice_ids,
+            self.positions,
+            self.lengths,
+        ):
+            yield (
+                _SEQUENCE_TYPES[sequence_type_id],
+                strings[piece_id],
+                strings[part_id],
+                strings[voice_id],
+                position,
+                length,
+            )
+
+    def __len__(self):
+        return len(self.positions)
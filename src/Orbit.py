@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+from GeneralInterval import invert_code
+from SequenceType import SequenceType
+
+# Iterating an Enum is slow, the order is the one of the interval classes.
+_SEQUENCE_TYPES = tuple(SequenceType)
+
+
+@dataclass(frozen=True)
+class Orbit:
+    # All sequences which are sequence types of each other, represented by
+    # the smallest of them. sequence_type turns the representative into the
+    # sequence, the stabilizer contains the sequence types which leave the
+    # representative unchanged.
+    representative: Tuple[int, ...]
+    sequence_type: SequenceType
+    stabilizer: Tuple[SequenceType, ...]
+
+    @classmethod
+    def from_codes(cls, codes: Sequence[int]) -> Optional["Orbit"]:
+        codes = tuple(codes)
+        inverted = tuple(invert_code(code) for code in codes)
+        # Inverting a descending unison gives an ascending one, which is
+        # inverted to itself. Such sequences have no orbit.
+        if tuple(invert_code(code) for code in inverted) != codes:
+            return None
+
+        variants = {
+            SequenceType.ORIGINAL: codes,
+            SequenceType.INVERTED: inverted,
+            SequenceType.MIRRORED: inverted[::-1],
+            SequenceType.MIRRORED_INVERTED: codes[::-1],
+        }
+        representative = min(variants.values())
+        sequence_type = next(
+            sequence_type
+            for sequence_type, variant in variants.items()
+            if variant == representative
+        )
+        stabilizer = tuple(
+            other
+            for other in _SEQUENCE_TYPES
+            if variants[other.compose(sequence_type)] == representative
+        )
+        return cls(representative, sequence_type, stabilizer)
+
+    def get_sequence_type(self, other: "Orbit") -> Optional[SequenceType]:
+        # The first sequence type turning the sequence of this orbit into the
+        # sequence of other, like IntervalClasses.get_sequence_type.
+        if other.representative != self.representative:
+            return None
+        relative = self.sequence_type.compose(other.sequence_type)
+        return next(
+            sequence_type
+            for sequence_type in _SEQUENCE_TYPES
+            if sequence_type.compose(relative) in self.stabilizer
+        )
@@ -0,0 +1,55 @@
+import gzip
+from enum import Enum
+from pathlib import Path
+from typing import BinaryIO
+
+
+class OutputCompression(Enum):
+    NONE = 0
+    GZIP = 1
+    ZSTD = 2
+
+    @property
+    def suffix(self) -> str:
+        if self is OutputCompression.GZIP:
+            return ".gz"
+        elif self is OutputCompression.ZSTD:
+            return ".zst"
+        return ""
+
+    def open(self, path: Path) -> BinaryIO:
+        if self is OutputCompression.GZIP:
+            return gzip.open(path, "wb")
+        elif self is OutputCompression.ZSTD:
+            return _zstandard().ZstdCompressor().stream_writer(open(path, "wb"))
+        return open(path, "wb")
+
+    def open_for_reading(self, path: Path) -> BinaryIO:
+        if self is OutputCompression.GZIP:
+            return gzip.open(path, "rb")
+        elif self is OutputCompression.ZSTD:
+            return _zstandard().ZstdDecompressor().stream_reader(open(path, "rb"))
+        return open(path, "rb")
+
+    @classmethod
+    def from_path(cls, path: Path) -> "OutputCompression":
+        for compression in (OutputCompression.GZIP, OutputCompression.ZSTD):
+            if path.suffix == compression.suffix:
+                return compression
+        return OutputCompression.NONE
+
+    @classmethod
+    def from_string(cls, s: str) -> "OutputCompression":
+        lower_map = {member.name.lower(): member for member in cls}
+        return lower_map.get(s.lower().replace("-", "_"))
+
+
+def _zstandard():
+    # zstandard is optional, it is only needed for this compression.
+    try:
+        import zstandard
+    except ImportError as error:
+        raise ImportError(
+            "ZSTD compression needs the zstandard package, install it with `uv pip install zstandard`"
+        ) from error
+    return zstandard
@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class OutputFormat(Enum):
+    JSON = 0
+    NPZ = 1
+    SQLITE = 2
+
+    @classmethod
+    def from_string(cls, s: str) -> "OutputFormat":
+        lower_map = {member.name.lower(): member for member in cls}
+        return lower_map.get(s.lower().replace("-", "_"))
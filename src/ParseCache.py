@@ -0,0 +1,113 @@
+import hashlib
+import json
+import logging
+import os
+from array import array
+from dataclasses import fields
+from pathlib import Path
+from typing import Optional
+
+from EncodedVoice import EncodedVoice
+from ParseOptions import ParseOptions
+from Part import Part
+from Piece import Piece
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".json"
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+
+
+class ParseCache:
+    def __init__(self, folder: Path, max_size: int = DEFAULT_MAX_SIZE):
+        self.folder = folder
+        self.max_size = max_size
+
+    def key(self, file: Path, options: Optional[ParseOptions] = None) -> str:
+        if options is None:
+            options = ParseOptions()
+
+        digest = hashlib.sha256()
+        digest.update(f"v{CACHE_VERSION}".encode())
+        for field in fields(options):
+            value = getattr(options, field.name)
+            digest.update(f"{field.name}={value.name};".encode())
+        with open(file, "rb") as content:
+            for chunk in iter(lambda: content.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> Path:
+        return self.folder / f"{key}{CACHE_SUFFIX}"
+
+    def load(self, key: str, title: str) -> Optional[Piece]:
+        entry = self.entry_path(key)
+        if not entry.exists():
+            return None
+
+        try:
+            with open(entry, "r") as cached:
+                data = json.load(cached)
+            parts = [
+                Part(
+                    id=part["id"],
+                    voices=[
+                        EncodedVoice(
+                            id=voice["id"],
+                            diatonic_note_numbers=array("h", voice["notes"]),
+                        )
+                        for voice in part["voices"]
+                    ],
+                )
+                for part in data["parts"]
+            ]
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            logging.warning(f"Removing unreadable cache entry {entry}: {error}")
+            entry.unlink(missing_ok=True)
+            return None
+
+        # Mark the entry as recently used for the eviction.
+        os.utime(entry)
+        logging.info(f"Using cached voices for {title}")
+        return Piece(title, parts)
+
+    def store(self, key: str, piece: Piece) -> None:
+        self.folder.mkdir(parents=True, exist_ok=True)
+        data = {
+            "parts": [
+                {
+                    "id": part.id,
+                    "voices": [
+                        {
+                            "id": voice.id,
+                            "notes": voice.diatonic_note_numbers.tolist(),
+                        }
+                        for voice in part.encode().voices
+                    ],
+                }
+                for part in piece.parts
+            ]
+        }
+
+        entry = self.entry_path(key)
+        temporary = entry.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporary, "w") as cached:
+            json.dump(data, cached)
+        os.replace(temporary, entry)
+
+    def evict(self) -> None:
+        if not self.folder.exists():
+            return
+
+        entries = [
+            (entry.stat(), entry) for entry in self.folder.glob(f"*{CACHE_SUFFIX}")
+        ]
+        total_size = sum(stat.st_size for stat, _ in entries)
+        if total_size <= self.max_size:
+            return
+
+        logging.info(f"Cache {self.folder} exceeds {self.max_size} bytes, evicting")
+        for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime):
+            if total_size <= self.max_size:
+                break
+            entry.unlink(missing_ok=True)
+            total_size -= stat.st_size
@@ -42,8 +42,19 @@ class ChordTreatment(Enum):
         return lower_map.get(s.lower().replace("-", "_"))
 
 
+class ParserBackend(Enum):
+    MUSIC21 = 0
+    STREAMING = 1
+
+    @classmethod
+    def from_string(cls, s: str) -> "ParserBackend":
+        lower_map = {member.name.lower(): member for member in cls}
+        return lower_map.get(s.lower().replace("-", "_"))
+
+
 @dataclass
 class ParseOptions:
     rest_treatment: RestTreatment = RestTreatment.NONE
     chord_treatment: ChordTreatment = ChordTreatment.HIGHEST
     accidental_treatment: AccidentalTreatment = AccidentalTreatment.REMOVE_ACCIDENTALS
+    parser_backend: ParserBackend = ParserBackend.MUSIC21
@@ -6,6 +6,7 @@ from music21 import stream, chord
 from music21.harmony import Harmony
 from music21.note import Rest, GeneralNote
 
+from EncodedVoice import EncodedVoice
 from ParseOptions import ParseOptions, ChordTreatment
 from Voice import Voice
 from music21.stream import Part as Part21
@@ -14,7 +15,7 @@ from music21.stream import Part as Part21
 @dataclass
 class Part:
     id: str
-    voices: List[Voice]
+    voices: List[Voice | EncodedVoice]
 
     @classmethod
     def parse(
@@ -37,6 +38,17 @@ class Part:
 
         return cls(id=id, voices=voices)
 
+    def encode(self) -> "Part":
+        return Part(
+            id=self.id,
+            voices=[
+                voice
+                if isinstance(voice, EncodedVoice)
+                else EncodedVoice.from_voice(voice)
+                for voice in self.voices
+            ],
+        )
+
 
 def extract_voices(
     part: Part21, voice_ids: List[str], options: Optional[ParseOptions] = None
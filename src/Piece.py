@@ -6,8 +6,9 @@ from typing import List, Optional
 
 from music21 import converter
 
-from ParseOptions import ParseOptions
+from ParseOptions import ParseOptions, ParserBackend
 from Part import Part
+from StreamingParser import parse_parts, UnsupportedMusicXmlError
 
 
 @dataclass
@@ -17,6 +18,12 @@ class Piece:
 
     @classmethod
     def parse(cls, file: Path, options: Optional[ParseOptions] = None) -> "Piece":
+        if options is not None and options.parser_backend is ParserBackend.STREAMING:
+            try:
+                return cls(file.stem, parse_parts(file, options))
+            except UnsupportedMusicXmlError as error:
+                logging.warning(f"Falling back to music21 for {file}: {error}")
+
         logging.info(f"Reading file {file}")
         score = converter.parse(file)
 
@@ -28,3 +35,6 @@ class Piece:
         title = file.stem
 
         return cls(title, parts)
+
+    def encode(self) -> "Piece":
+        return Piece(self.title, [part.encode() for part in self.parts])
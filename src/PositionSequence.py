@@ -1,22 +1,22 @@
+import heapq
 from dataclasses import dataclass
 from typing import List
 
-from MotivePosition import MotivePosition
+from Occurrence import Occurrence
 
 
 @dataclass
 class PositionSequence:
-    sequence: List[MotivePosition]
+    sequence: List[Occurrence]
 
-    def __init__(self, sequence: List[MotivePosition]):
+    def __init__(self, sequence: List[Occurrence]):
+        # Keeps the first of the same positions, in the order they are given.
+        seen = set()
         unique_positions = []
         for position in sequence:
-            is_in_unique_positions = any(
-                position.is_same_position(unique_position)
-                for unique_position in unique_positions
-            )
-
-            if not is_in_unique_positions:
+            key = (position.position, position.length)
+            if key not in seen:
+                seen.add(key)
                 unique_positions.append(position)
 
         self.sequence = unique_positions
@@ -24,3 +24,16 @@ class PositionSequence:
     def merge(self, other: "PositionSequence") -> None:
         both_sequences = self.sequence + other.sequence
         self.__init__(both_sequences)
+
+    @classmethod
+    def merge_sorted(cls, sequences: List["PositionSequence"]) -> "PositionSequence":
+        # The sequences have to be sorted by position and length, the merged
+        # sequence is sorted as well.
+        return cls(
+            list(
+                heapq.merge(
+                    *(sequence.sequence for sequence in sequences),
+                    key=lambda position: (position.position, position.length),
+                )
+            )
+        )
@@ -1,4 +1,7 @@
 from enum import Enum
+from typing import Tuple
+
+from GeneralInterval import invert_code
 
 
 class SequenceType(str, Enum):
@@ -9,3 +12,33 @@ class SequenceType(str, Enum):
 
     def __str__(self):
         return self.name
+
+    def apply(self, codes: Tuple[int, ...]) -> Tuple[int, ...]:
+        reversed_, inverted = _TRANSFORMATIONS[self]
+        if reversed_:
+            codes = codes[::-1]
+        if inverted:
+            codes = tuple(invert_code(code) for code in codes)
+        return codes
+
+    def compose(self, other: "SequenceType") -> "SequenceType":
+        # Reversing and inverting commute and undo themselves, so applying
+        # two sequence types is applying both transformations once.
+        reversed_, inverted = _TRANSFORMATIONS[self]
+        other_reversed, other_inverted = _TRANSFORMATIONS[other]
+        return _SEQUENCE_TYPES[
+            (reversed_ != other_reversed, inverted != other_inverted)
+        ]
+
+
+# Whether a sequence type reverses and whether it inverts the intervals.
+_TRANSFORMATIONS = {
+    SequenceType.ORIGINAL: (False, False),
+    SequenceType.INVERTED: (False, True),
+    SequenceType.MIRRORED: (True, True),
+    SequenceType.MIRRORED_INVERTED: (True, False),
+}
+_SEQUENCE_TYPES = {
+    transformation: sequence_type
+    for sequence_type, transformation in _TRANSFORMATIONS.items()
+}
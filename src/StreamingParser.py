@@ -0,0 +1,651 @@
+import logging
+import xml.etree.ElementTree as ET
+from array import array
+from dataclasses import dataclass, field
+from fractions import Fraction
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from music21.musicxml.xmlToM21 import MeasureParser
+from music21.pitch import Accidental, AccidentalException
+
+from EncodedVoice import EncodedVoice, REST
+from ParseOptions import ParseOptions, ChordTreatment
+from Part import Part
+
+STEPS = "CDEFGAB"
+
+TYPE_QUARTER_LENGTHS = {
+    "maxima": Fraction(32),
+    "long": Fraction(16),
+    "breve": Fraction(8),
+    "whole": Fraction(4),
+    "half": Fraction(2),
+    "quarter": Fraction(1),
+    "eighth": Fraction(1, 2),
+    "16th": Fraction(1, 4),
+    "32nd": Fraction(1, 8),
+    "64th": Fraction(1, 16),
+    "128th": Fraction(1, 32),
+    "256th": Fraction(1, 64),
+    "512th": Fraction(1, 128),
+    "1024th": Fraction(1, 256),
+}
+
+DEFAULT_DIVISIONS = Fraction(10080)
+DEFAULT_BAR_DURATION = Fraction(4)
+
+NOTE = "note"
+REST_ELEMENT = "rest"
+UNPITCHED = "unpitched"
+CHORD = "chord"
+PERCUSSION_CHORD = "percussion_chord"
+
+
+class UnsupportedMusicXmlError(Exception):
+    pass
+
+
+@dataclass
+class Pitch:
+    step: str
+    accidental: Optional[str]
+    octave: int
+
+    @property
+    def diatonic_note_number(self) -> int:
+        return 7 * self.octave + STEPS.index(self.step) + 1
+
+
+@dataclass(eq=False)
+class Element:
+    kind: str
+    offset: Fraction
+    duration: Fraction
+    pitches: List[Pitch] = field(default_factory=list)
+    tie: Optional[str] = None
+    grace: bool = False
+    full_measure: bool = False
+    duration_type: Optional[str] = None
+    dots: int = 0
+    has_tuplets: bool = False
+    order: int = 0
+    deleted: bool = False
+
+    def sort_key(self) -> Tuple[Fraction, int, int]:
+        return self.offset, 0 if self.grace else 1, self.order
+
+
+@dataclass
+class Measure:
+    bar_duration: Fraction
+    elements: List[Element] = field(default_factory=list)
+    voices: Dict[str, List[Element]] = field(default_factory=dict)
+    orphans: List[Element] = field(default_factory=list)
+
+
+def parse_parts(file: Path, options: Optional[ParseOptions] = None) -> List[Part]:
+    if options is None:
+        options = ParseOptions()
+
+    logging.info(f"Streaming parts from {file}")
+    parts: List[Part] = []
+    part_names: Dict[Optional[str], Optional[str]] = {}
+    parser: Optional[PartParser] = None
+    root = None
+    for event, element in ET.iterparse(file, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+                if root.tag != "score-partwise":
+                    raise UnsupportedMusicXmlError(f"Unsupported root {root.tag}")
+            elif element.tag == "part" and parser is None:
+                part_id = element.get("id")
+                parser = PartParser(part_names.get(part_id, part_id))
+            continue
+
+        if element.tag == "score-part":
+            part_names[element.get("id")] = part_name(element)
+        elif element.tag == "measure" and parser is not None:
+            parser.parse_measure(element)
+            element.clear()
+        elif element.tag == "part" and parser is not None:
+            parts.append(parser.to_part(str(len(parts)), options))
+            parser = None
+            element.clear()
+
+    return parts
+
+
+class PartParser:
+    def __init__(self, part_id: Optional[str]):
+        self.part_id = part_id
+        self.measures: List[Measure] = []
+        self.divisions = DEFAULT_DIVISIONS
+        self.time_signature: Optional[Fraction] = None
+        self.last_measure_ended_with_forward: Optional[Element] = None
+        self.order = 0
+
+    def next_order(self) -> int:
+        self.order += 1
+        return self.order
+
+    def parse_measure(self, mx_measure: ET.Element) -> None:
+        children = list(mx_measure)
+        voice_ids = sorted(
+            {
+                voice.text.strip()
+                for voice in mx_measure.iterfind("note/voice")
+                if voice.text is not None and voice.text.strip()
+            }
+        )
+        use_voices = len(voice_ids) > 1
+        measure_time_signature: Optional[Fraction] = None
+        measure = Measure(bar_duration=DEFAULT_BAR_DURATION)
+        if use_voices:
+            measure.voices = {voice_id: [] for voice_id in voice_ids}
+
+        offset = Fraction(0)
+        last_voice = None
+        chord_notes: List[ET.Element] = []
+        rest_count = 0
+        note_count = 0
+        full_measure_rest = False
+        ended_with_forward: Optional[Element] = None
+
+        def insert(mx_element: ET.Element, element: Element) -> None:
+            nonlocal last_voice
+            element.offset = offset
+            element.order = self.next_order()
+            if not use_voices:
+                measure.elements.append(element)
+                return
+
+            mx_voice = mx_element.find("voice")
+            if mx_voice is None or mx_voice.text is None or not mx_voice.text.strip():
+                voice_id = last_voice if last_voice is not None else 1
+            else:
+                voice_id = mx_voice.text.strip()
+                last_voice = as_int_if_possible(voice_id)
+            if str(voice_id) in measure.voices:
+                measure.voices[str(voice_id)].append(element)
+            else:
+                measure.orphans.append(element)
+
+        for index, child in enumerate(children):
+            if child.tag == "attributes":
+                measure_time_signature = (
+                    self.parse_attributes(child) or measure_time_signature
+                )
+            elif child.tag == "note":
+                next_is_chord = (
+                    index + 1 < len(children)
+                    and children[index + 1].tag == "note"
+                    and children[index + 1].find("chord") is not None
+                )
+                is_rest = child.find("rest") is not None
+                is_chord = child.find("chord") is not None or next_is_chord
+                if next_is_chord:
+                    mx_voice = child.find("voice")
+                    if mx_voice is not None:
+                        last_voice = as_int_if_possible(mx_voice.text)
+
+                increment = Fraction(0)
+                if is_chord:
+                    chord_notes.append(child)
+                elif not is_rest:
+                    note_count += 1
+                    element = self.simple_note(child)
+                    insert(child, element)
+                    increment = element.duration
+                else:
+                    rest_count += 1
+                    element = self.rest(child)
+                    full_measure_rest = full_measure_rest or element.full_measure
+                    insert(child, element)
+                    increment = element.duration
+
+                if chord_notes and not next_is_chord:
+                    element = self.chord(chord_notes)
+                    voiced = [n for n in chord_notes if n.find("voice") is not None]
+                    insert(voiced[0] if voiced else child, element)
+                    increment = element.duration
+                    chord_notes = []
+
+                offset += increment
+                ended_with_forward = None
+            elif child.tag == "backup":
+                offset = max(offset - self.duration(child), Fraction(0))
+            elif child.tag == "forward":
+                if child.find("duration") is not None:
+                    change = self.duration(child)
+                    # A rest created with a quarter length of zero gets the
+                    # default quarter length in music21.
+                    element = Element(REST_ELEMENT, offset, change or Fraction(1))
+                    insert(child, element)
+                    offset += change
+                    ended_with_forward = element
+
+        if measure_time_signature is not None:
+            self.time_signature = measure_time_signature
+        measure.bar_duration = (
+            self.time_signature
+            if self.time_signature is not None
+            else DEFAULT_BAR_DURATION
+        )
+
+        if use_voices:
+            self.fill_voice_gaps(measure)
+
+        if (rest_count == 1 and note_count == 0) or full_measure_rest:
+            self.adjust_full_measure_rest(measure)
+
+        if not (measure.elements or measure.orphans or any(measure.voices.values())):
+            # music21 fills empty measures with a rest of the whole bar.
+            measure.elements.append(
+                Element(
+                    REST_ELEMENT,
+                    Fraction(0),
+                    measure.bar_duration,
+                    order=self.next_order(),
+                )
+            )
+
+        self.last_measure_ended_with_forward = (
+            ended_with_forward if not use_voices else None
+        )
+        self.measures.append(measure)
+
+    def parse_attributes(self, mx_attributes: ET.Element) -> Optional[Fraction]:
+        mx_divisions = mx_attributes.find("divisions")
+        if mx_divisions is not None and mx_divisions.text:
+            self.divisions = Fraction(mx_divisions.text.strip())
+
+        for mx_staves in mx_attributes.iterfind("staves"):
+            if int(mx_staves.text) > 1:
+                raise UnsupportedMusicXmlError(
+                    f"Part {self.part_id} has more than one staff"
+                )
+
+        bar_duration = None
+        for mx_time in mx_attributes.iterfind("time"):
+            beats = [mx.text for mx in mx_time.iterfind("beats")]
+            beat_types = [mx.text for mx in mx_time.iterfind("beat-type")]
+            if not beats or len(beats) != len(beat_types):
+                continue
+            bar_duration = sum(
+                (
+                    Fraction(sum(int(beat) for beat in beat_text.split("+")))
+                    * 4
+                    / int(beat_type)
+                    for beat_text, beat_type in zip(beats, beat_types)
+                ),
+                Fraction(0),
+            )
+        return bar_duration
+
+    def duration(self, mx_element: ET.Element) -> Fraction:
+        mx_duration = mx_element.find("duration")
+        if mx_duration is None or not mx_duration.text:
+            return Fraction(0)
+        return Fraction(mx_duration.text.strip()) / self.divisions
+
+    def note_duration(self, mx_note: ET.Element) -> Tuple[Fraction, Optional[str], int]:
+        mx_type = mx_note.find("type")
+        duration_type = mx_type.text.strip() if mx_type is not None else None
+        dots = len(mx_note.findall("dot"))
+        if mx_note.find("grace") is not None:
+            return Fraction(0), duration_type, dots
+        if mx_note.find("duration") is not None:
+            return self.duration(mx_note), duration_type, dots
+        if duration_type in TYPE_QUARTER_LENGTHS:
+            return (
+                TYPE_QUARTER_LENGTHS[duration_type] * (2 - Fraction(1, 2**dots)),
+                duration_type,
+                dots,
+            )
+        return Fraction(0), duration_type, dots
+
+    def simple_note(self, mx_note: ET.Element) -> Element:
+        duration, duration_type, dots = self.note_duration(mx_note)
+        kind = UNPITCHED if mx_note.find("unpitched") is not None else NOTE
+        return Element(
+            kind,
+            Fraction(0),
+            duration,
+            pitches=[parse_pitch(mx_note)] if kind is NOTE else [],
+            tie=parse_tie(mx_note),
+            grace=mx_note.find("grace") is not None,
+            duration_type=duration_type,
+            dots=dots,
+            has_tuplets=mx_note.find("time-modification") is not None,
+        )
+
+    def rest(self, mx_note: ET.Element) -> Element:
+        duration, duration_type, dots = self.note_duration(mx_note)
+        return Element(
+            REST_ELEMENT,
+            Fraction(0),
+            duration,
+            full_measure=mx_note.find("rest").get("measure") == "yes",
+            duration_type=duration_type,
+            dots=dots,
+            has_tuplets=mx_note.find("time-modification") is not None,
+        )
+
+    def chord(self, mx_notes: List[ET.Element]) -> Element:
+        notes = [self.simple_note(mx_note) for mx_note in mx_notes]
+        is_percussion = any(note.kind is UNPITCHED for note in notes)
+        ties = [note.tie for note in notes if note.tie is not None]
+        return Element(
+            PERCUSSION_CHORD if is_percussion else CHORD,
+            Fraction(0),
+            notes[0].duration,
+            pitches=[] if is_percussion else [note.pitches[0] for note in notes],
+            tie=ties[0] if ties else None,
+            grace=notes[0].grace,
+        )
+
+    def fill_voice_gaps(self, measure: Measure) -> None:
+        # music21 fills each voice up to the end of the measure, but only
+        # sees the voices it already filled: the later ones still report
+        # the end time they had while they were empty.
+        measure_end = max(
+            (element.offset + element.duration for element in measure.orphans),
+            default=Fraction(0),
+        )
+
+        for voice_id, elements in measure.voices.items():
+            if not elements:
+                continue
+            voice_start = min(element.offset for element in elements)
+            voice_end = max(element.offset + element.duration for element in elements)
+            measure_end = max(measure_end, voice_end)
+            if voice_start > 0:
+                elements.append(
+                    Element(
+                        REST_ELEMENT,
+                        Fraction(0),
+                        voice_start,
+                        order=self.next_order(),
+                    )
+                )
+            if measure_end > voice_end:
+                elements.append(
+                    Element(
+                        REST_ELEMENT,
+                        voice_end,
+                        measure_end - voice_end,
+                        order=self.next_order(),
+                    )
+                )
+
+            elements.sort(key=Element.sort_key)
+            gaps = []
+            current_end = Fraction(0)
+            for element in elements:
+                if element.offset > current_end:
+                    gaps.append(
+                        Element(
+                            REST_ELEMENT,
+                            current_end,
+                            element.offset - current_end,
+                            order=self.next_order(),
+                        )
+                    )
+                current_end = max(current_end, element.offset + element.duration)
+            elements.extend(gaps)
+            elements.sort(key=Element.sort_key)
+
+    def adjust_full_measure_rest(self, measure: Measure) -> None:
+        rests = sorted(
+            (e for e in measure.elements if e.kind is REST_ELEMENT),
+            key=Element.sort_key,
+        )
+        if not rests:
+            return
+
+        rest = rests[0]
+        bar_duration = measure.bar_duration
+        if rest.full_measure or (
+            rest.duration != bar_duration
+            and rest_duration_type(rest) in ("whole", "breve")
+            and rest.dots == 0
+            and not rest.has_tuplets
+        ):
+            rest.duration = bar_duration
+            rest.full_measure = True
+
+    def remove_end_forward_rest(self) -> None:
+        forward_rest = self.last_measure_ended_with_forward
+        if forward_rest is None or not self.measures:
+            return
+        last_measure = self.measures[-1]
+        last_element = max(last_measure.elements, key=Element.sort_key)
+        if last_element is forward_rest:
+            last_measure.elements.remove(forward_rest)
+
+    def strip_ties(self) -> None:
+        flat: List[Element] = []
+        for measure in self.measures:
+            groups = [measure.elements] + list(measure.voices.values())
+            groups.append(measure.orphans)
+            keyed = []
+            for group_index, group in enumerate(groups):
+                for position, element in enumerate(sorted(group, key=Element.sort_key)):
+                    if element.duration > 0:
+                        keyed.append(((element.offset, group_index, position), element))
+            keyed.sort(key=lambda item: item[0])
+            flat.extend(element for _, element in keyed)
+
+        strip_ties(flat)
+
+    def to_part(self, unique_id: str, options: ParseOptions) -> Part:
+        self.remove_end_forward_rest()
+        self.strip_ties()
+
+        voice_ids: List[str] = []
+        for measure in self.measures:
+            for voice_id in measure.voices:
+                if voice_id not in voice_ids:
+                    voice_ids.append(voice_id)
+        if len(voice_ids) == 0:
+            voice_ids.append("0")
+
+        part_data: Dict[str, List[Element]] = {voice_id: [] for voice_id in voice_ids}
+        for measure in self.measures:
+            if not measure.voices:
+                part_data[voice_ids[0]].extend(
+                    sorted(measure.elements, key=Element.sort_key)
+                )
+                for voice_id in voice_ids[1:]:
+                    part_data[voice_id].append(
+                        Element(REST_ELEMENT, Fraction(0), measure.bar_duration)
+                    )
+            for voice_id, elements in measure.voices.items():
+                part_data[voice_id].extend(elements)
+
+        return Part(
+            id=f"{self.part_id}_{unique_id}",
+            voices=[
+                encode_voice(voice_id, part_data[voice_id], options)
+                for voice_id in voice_ids
+            ],
+        )
+
+
+def encode_voice(
+    voice_id: str, elements: List[Element], options: ParseOptions
+) -> EncodedVoice:
+    quarter_length_limit = options.rest_treatment.quarter_length_to_remove()
+
+    numbers = array("h")
+    for element in elements:
+        if element.deleted:
+            continue
+
+        kind = element.kind
+        if kind is CHORD:
+            if options.chord_treatment is ChordTreatment.LOWEST:
+                numbers.append(
+                    min(pitch.diatonic_note_number for pitch in element.pitches)
+                )
+                continue
+            elif options.chord_treatment is ChordTreatment.REMOVE:
+                kind = REST_ELEMENT
+            else:
+                numbers.append(
+                    max(pitch.diatonic_note_number for pitch in element.pitches)
+                )
+                continue
+
+        if kind is NOTE:
+            numbers.append(element.pitches[0].diatonic_note_number)
+        elif kind is REST_ELEMENT:
+            if quarter_length_limit is None or element.duration > quarter_length_limit:
+                numbers.append(REST)
+        else:
+            # Unpitched notes and percussion chords are neither notes nor
+            # removable rests.
+            numbers.append(REST)
+
+    return EncodedVoice(id=voice_id, diatonic_note_numbers=numbers)
+
+
+def strip_ties(elements: List[Element]) -> None:
+    # Mirrors music21's Stream.stripTies(matchByPitch=True) on the flattened
+    # part, which is what Part.parse runs before extracting the voices.
+    connected: List[int] = []
+
+    def is_end_match(index: int) -> bool:
+        element = elements[index]
+        if element.kind in (NOTE, UNPITCHED) and element.tie == "stop":
+            return True
+        if index == 0 or index - 1 not in connected:
+            return False
+        last = elements[index - 1]
+        if element.kind is NOTE and last.kind is NOTE:
+            return same_pitches(last.pitches, element.pitches)
+        if element.kind is not NOTE:
+            return same_pitches(last.pitches, element.pitches)
+        return False
+
+    for index, element in enumerate(elements):
+        end_match = None
+        if element.tie == "start":
+            if index == 0 or index - 1 not in connected:
+                connected = [index]
+            else:
+                connected.append(index)
+            end_match = False
+        elif element.tie == "continue":
+            if not connected:
+                connected.append(index)
+            elif is_end_match(index):
+                connected.append(index)
+            else:
+                connected = [index]
+            end_match = False
+
+        if end_match is None:
+            end_match = is_end_match(index)
+
+        if end_match:
+            connected.append(index)
+            if len(connected) < 2:
+                connected = []
+                continue
+
+            first = elements[connected[0]]
+            for tied_index in connected[1:]:
+                first.duration += elements[tied_index].duration
+                elements[tied_index].deleted = True
+            first.tie = None
+            connected = []
+
+
+def same_pitches(first: List[Pitch], second: List[Pitch]) -> bool:
+    return len(first) == len(second) and all(
+        (a.step, a.accidental, a.octave) == (b.step, b.accidental, b.octave)
+        for a, b in zip(first, second)
+    )
+
+
+def parse_pitch(mx_note: ET.Element) -> Pitch:
+    mx_pitch = mx_note.find("pitch")
+    if mx_pitch is None:
+        raise UnsupportedMusicXmlError("Note without pitch")
+    # Pitches of tied notes are compared by the name of their accidental
+    # like in music21, so an explicit natural differs from no accidental.
+    mx_alter = mx_pitch.find("alter")
+    mx_accidental = mx_note.find("accidental")
+    accidental = None
+    if mx_accidental is not None and mx_accidental.text and mx_accidental.text.strip():
+        name = mx_accidental.text.strip().lower()
+        accidental = MeasureParser.mxAccidentalNameToM21.get(name, name)
+    elif mx_alter is not None and mx_alter.text and mx_alter.text.strip():
+        accidental = accidental_name(float(mx_alter.text.strip()))
+
+    return Pitch(
+        step=mx_pitch.findtext("step").strip(),
+        accidental=accidental,
+        octave=int(mx_pitch.findtext("octave")),
+    )
+
+
+@lru_cache
+def accidental_name(alter: float) -> str:
+    try:
+        return Accidental(alter).name
+    except AccidentalException as error:
+        raise UnsupportedMusicXmlError(f"Unsupported alter {alter}") from error
+
+
+def parse_tie(mx_note: ET.Element) -> Optional[str]:
+    mx_ties = mx_note.findall("tie")
+    if not mx_ties:
+        return None
+    types = [mx_tie.get("type") for mx_tie in mx_ties if mx_tie.get("type")]
+    if len(types) == 1:
+        return types[0]
+    elif "stop" in types and "start" in types:
+        return "continue"
+    return "start"
+
+
+def part_name(mx_score_part: ET.Element) -> Optional[str]:
+    # music21 names the part after the best name of its default instrument.
+    for path in (
+        "part-name",
+        "part-abbreviation",
+        "score-instrument/instrument-name",
+        "score-instrument/instrument-abbreviation",
+    ):
+        mx_name = mx_score_part.find(path)
+        if mx_name is not None and mx_name.text not in (None, ""):
+            return mx_name.text.strip().replace("\n", " ")
+
+    for path in ("midi-instrument/midi-program", "midi-instrument/midi-unpitched"):
+        mx_midi = mx_score_part.find(path)
+        if mx_midi is not None and mx_midi.text is not None and mx_midi.text.strip():
+            raise UnsupportedMusicXmlError(
+                f"Part {mx_score_part.get('id')} is only named by its midi instrument"
+            )
+    return mx_score_part.get("id")
+
+
+def rest_duration_type(rest: Element) -> Optional[str]:
+    if rest.duration_type is not None:
+        return rest.duration_type
+    for duration_type, quarter_length in TYPE_QUARTER_LENGTHS.items():
+        if quarter_length == rest.duration:
+            return duration_type
+    return None
+
+
+def as_int_if_possible(text: Optional[str]):
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        return text
@@ -0,0 +1,72 @@
+import numpy as np
+
+
+def rank_by_first_appearance(codes: np.ndarray) -> np.ndarray:
+    if len(codes) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    _, first_indices, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    order = np.argsort(first_indices)
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order))
+    return ranks[inverse.reshape(-1)]
+
+
+def suffix_array(ranks: np.ndarray) -> np.ndarray:
+    # Prefix doubling: sort the suffixes by their first 2 * step symbols
+    # until all of them have a distinct rank.
+    n = len(ranks)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    rank = ranks.astype(np.int64)
+    step = 1
+    while True:
+        second = np.full(n, -1, dtype=np.int64)
+        if step < n:
+            second[: n - step] = rank[step:]
+        order = np.lexsort((second, rank))
+
+        sorted_rank = rank[order]
+        sorted_second = second[order]
+        changed = np.ones(n, dtype=bool)
+        changed[1:] = (sorted_rank[1:] != sorted_rank[:-1]) | (
+            sorted_second[1:] != sorted_second[:-1]
+        )
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.cumsum(changed) - 1
+
+        if rank[order[-1]] == n - 1:
+            return order
+        step *= 2
+
+
+def lcp_array(ranks: np.ndarray, suffixes: np.ndarray) -> np.ndarray:
+    # Kasai et al.: lcp[i] is the length of the longest common prefix of the
+    # suffixes at suffixes[i - 1] and suffixes[i], lcp[0] is 0.
+    n = len(suffixes)
+    values = ranks.tolist()
+    suffix_list = suffixes.tolist()
+    rank = [0] * n
+    for index, suffix in enumerate(suffix_list):
+        rank[suffix] = index
+
+    lcp = [0] * n
+    common = 0
+    for suffix in range(n):
+        index = rank[suffix]
+        if index == 0:
+            common = 0
+            continue
+        previous = suffix_list[index - 1]
+        while (
+            suffix + common < n
+            and previous + common < n
+            and values[suffix + common] == values[previous + common]
+        ):
+            common += 1
+        lcp[index] = common
+        if common > 0:
+            common -= 1
+
+    return np.array(lcp, dtype=np.int64)
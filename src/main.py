@@ -1,8 +1,14 @@
 import logging
 
 from MotiveGenerator import MotiveGenerator
-from MotiveWriter import write_motives_as_json_to_file
+from MotiveWriter import (
+    write_motives_as_json_to_file,
+    write_motives_as_npz_to_file,
+    write_motives_as_sqlite_to_file,
+)
+from OutputFormat import OutputFormat
 from MainParser import parse_args
+from ParseCache import ParseCache
 
 
 def main():
@@ -14,13 +20,45 @@ def main():
         motive_generator_options.max_length,
         motive_generator_options.min_num_sequences,
         motive_generator_options.max_num_sequences,
+        motive_generator_options.execution_backend,
+        motive_generator_options.workers,
+        motive_generator_options.engine,
+        motive_generator_options.prune_breaks,
+        motive_generator_options.columnar_positions,
     )
 
+    parse_cache = None
+    if parser_options.cache_folder is not None:
+        parse_cache = ParseCache(
+            parser_options.cache_folder, parser_options.cache_max_size * 1024 * 1024
+        )
+
     motives = generator.discover_motives(
-        parser_options.input_folder, parser_options.options
+        parser_options.input_folder,
+        parser_options.options,
+        parse_workers=parser_options.parse_workers,
+        parse_cache=parse_cache,
     )
 
-    write_motives_as_json_to_file(motives, parser_options.output_folder)
+    if parser_options.output_format is OutputFormat.NPZ:
+        write_motives_as_npz_to_file(
+            motives,
+            parser_options.output_folder,
+            parser_options.output_compression,
+        )
+    elif parser_options.output_format is OutputFormat.SQLITE:
+        write_motives_as_sqlite_to_file(
+            motives,
+            parser_options.output_folder,
+            parser_options.output_compression,
+        )
+    else:
+        write_motives_as_json_to_file(
+            motives,
+            parser_options.output_folder,
+            parser_options.output_compression,
+            parser_options.pretty_output,
+        )
 
     logging.info("Done")
 
@@ -0,0 +1,30 @@
+import unittest
+from pathlib import Path
+
+from Corpus import Corpus
+from EncodedVoice import EncodedVoice
+from ParseOptions import ParseOptions
+
+
+class CorpusTest(unittest.TestCase):
+    options = ParseOptions()
+
+    def test_parallel_parse_returns_encoded_voices(self):
+        folder = Path("testData/parsing/basic")
+
+        serial = Corpus.parse(folder, self.options)
+        parallel = Corpus.parse(folder, self.options, workers=2)
+
+        self.assertEqual(
+            [piece.title for piece in parallel.pieces],
+            [piece.title for piece in serial.pieces],
+        )
+        for serial_piece, parallel_piece in zip(serial.pieces, parallel.pieces):
+            self.assertEqual(parallel_piece, serial_piece.encode())
+            for part in parallel_piece.parts:
+                for voice in part.voices:
+                    self.assertIsInstance(voice, EncodedVoice)
+
+
+if __name__ == "__main__":
+    unittest.main()
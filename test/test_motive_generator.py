@@ -1,7 +1,17 @@
 import unittest
 from pathlib import Path
 
+import numpy as np
+
+from ExecutionBackend import ExecutionBackend
+from GeneralInterval import (
+    BreakInterval,
+    RestIntervalType,
+    encode_interval,
+)
+from MiningEngine import MiningEngine
 from MotiveGenerator import MotiveGenerator
+from Occurrence import Occurrence
 from ParseOptions import ParseOptions
 from SequenceType import SequenceType
 
@@ -63,6 +73,58 @@ class MotiveGeneratorTest_DiscoverMotives(unittest.TestCase):
             motives[7].intervals.name(SequenceType.ORIGINAL), "['1', '-2', '-2']"
         )
 
+    def test_parallel_parsing_finds_same_motives(self):
+        file_path = Path("testData/multiple_pieces/same_motives")
+
+        motive_generator = MotiveGenerator(
+            min_frequency=1,
+            max_gap=0,
+            max_length=3,
+            min_num_sequences=3,
+            max_num_sequences=3,
+        )
+
+        serial_motives = motive_generator.discover_motives(
+            file_path=file_path, options=self.options
+        )
+        parallel_motives = motive_generator.discover_motives(
+            file_path=file_path, options=self.options, parse_workers=2
+        )
+
+        self.assertEqual(
+            parallel_motives.model_dump_json(), serial_motives.model_dump_json()
+        )
+
+    def test_execution_backends_find_same_motives(self):
+        file_path = Path("testData/parsing/basic")
+
+        serial_motives = MotiveGenerator(
+            min_frequency=1,
+            max_gap=1,
+            max_length=4,
+            min_num_sequences=2,
+            max_num_sequences=3,
+        ).discover_motives(file_path=file_path, options=self.options)
+
+        for execution_backend in (ExecutionBackend.THREAD, ExecutionBackend.PROCESS):
+            motive_generator = MotiveGenerator(
+                min_frequency=1,
+                max_gap=1,
+                max_length=4,
+                min_num_sequences=2,
+                max_num_sequences=3,
+                execution_backend=execution_backend,
+                workers=2,
+            )
+
+            motives = motive_generator.discover_motives(
+                file_path=file_path, options=self.options
+            )
+
+            self.assertEqual(
+                motives.model_dump_json(), serial_motives.model_dump_json()
+            )
+
     def test_chromatic_variation(self):
         file_path = Path("testData/chromatic_variation/input")
 
@@ -550,3 +612,229 @@ class MotiveGeneratorTest_DiscoverMotives(unittest.TestCase):
                 motives[i].intervals.name(SequenceType.ORIGINAL),
                 expected_motive["sequence"],
             )
+
+
+class MotiveGeneratorTest_JoinPositions(unittest.TestCase):
+    def test_should_extend_with_first_candidate_in_window(self):
+        motive_generator = MotiveGenerator(
+            min_frequency=1,
+            max_gap=2,
+            max_length=5,
+            min_num_sequences=2,
+            max_num_sequences=3,
+        )
+        positions = [
+            Occurrence(position=0, length=1),
+            Occurrence(position=3, length=2),
+            Occurrence(position=6, length=3),
+            Occurrence(position=12, length=1),
+        ]
+        candidate_starts = np.array([1, 2, 8, 10, 11])
+
+        joined = motive_generator.join_positions(positions, candidate_starts)
+
+        self.assertListEqual(
+            joined,
+            [
+                Occurrence(position=0, length=2),
+                Occurrence(position=6, length=5),
+            ],
+        )
+
+
+class MotiveGeneratorTest_GenerateCandidateExtension(unittest.TestCase):
+    def test_should_only_return_base_motives_in_window_after_occurrences(self):
+        sequence = [1, 2, 1, 3, 2, 4]
+        for max_gap, expected in [(1, [(1,), (2,), (3,)]), (0, [(2,), (3,)])]:
+            motive_generator = MotiveGenerator(
+                min_frequency=1,
+                max_gap=max_gap,
+                max_length=5,
+                min_num_sequences=2,
+                max_num_sequences=3,
+            )
+            basic_motives = motive_generator.get_basic_motives(sequence)
+            basic_motive_index = np.array([0, 1, 0, 2, 1, 3])
+
+            candidates = motive_generator.generate_candidate_extension(
+                basic_motives[0], basic_motives, basic_motive_index
+            )
+
+            self.assertListEqual(
+                [candidate.sequence for candidate in candidates], expected
+            )
+
+
+class MotiveGeneratorTest_GenerateMotives(unittest.TestCase):
+    sequence = [2, 2, -3, 2, 2, -3, 1, 2, 2, 4, -2, 2, 2, -3, 1, 3]
+
+    def test_should_only_return_frequent_motives(self):
+        for max_gap in (0, 1):
+            all_motives = MotiveGenerator(
+                min_frequency=1,
+                max_gap=max_gap,
+                max_length=6,
+                min_num_sequences=1,
+                max_num_sequences=4,
+            ).generate_motives(self.sequence)
+
+            frequent_motives = MotiveGenerator(
+                min_frequency=2,
+                max_gap=max_gap,
+                max_length=6,
+                min_num_sequences=1,
+                max_num_sequences=4,
+            ).generate_motives(self.sequence)
+
+            self.assertListEqual(
+                [(motive.sequence, motive.positions) for motive in frequent_motives],
+                [
+                    (motive.sequence, motive.positions)
+                    for motive in all_motives
+                    if motive.frequency >= 2
+                ],
+            )
+            self.assertLess(len(frequent_motives), len(all_motives))
+
+    def test_suffix_array_engine_should_find_same_motives_as_levelwise(self):
+        for min_frequency, min_num_sequences, max_num_sequences in [
+            (1, 1, 4),
+            (2, 3, 5),
+            (1, 2, 2),
+        ]:
+            motives = MotiveGenerator(
+                min_frequency=min_frequency,
+                max_gap=0,
+                max_length=5,
+                min_num_sequences=min_num_sequences,
+                max_num_sequences=max_num_sequences,
+                engine=MiningEngine.SUFFIX_ARRAY,
+            ).generate_motives(self.sequence)
+
+            levelwise_motives = MotiveGenerator(
+                min_frequency=min_frequency,
+                max_gap=0,
+                max_length=5,
+                min_num_sequences=min_num_sequences,
+                max_num_sequences=max_num_sequences,
+                engine=MiningEngine.LEVELWISE,
+            ).generate_motives(self.sequence)
+
+            self.assertListEqual(
+                [(motive.sequence, motive.positions) for motive in motives],
+                [(motive.sequence, motive.positions) for motive in levelwise_motives],
+            )
+
+    def test_gapped_engines_should_find_same_motives_as_levelwise(self):
+        for engine, (min_frequency, max_gap, max_length, max_num_sequences) in [
+            (engine, parameters)
+            for engine in (MiningEngine.PREFIX_SPAN, MiningEngine.VERTICAL)
+            for parameters in [(1, 1, 6, 4), (2, 2, 6, 5), (2, 3, 4, 3)]
+        ]:
+            motives = MotiveGenerator(
+                min_frequency=min_frequency,
+                max_gap=max_gap,
+                max_length=max_length,
+                min_num_sequences=2,
+                max_num_sequences=max_num_sequences,
+                engine=engine,
+            ).generate_motives(self.sequence)
+
+            levelwise_motives = MotiveGenerator(
+                min_frequency=min_frequency,
+                max_gap=max_gap,
+                max_length=max_length,
+                min_num_sequences=2,
+                max_num_sequences=max_num_sequences,
+                engine=MiningEngine.LEVELWISE,
+            ).generate_motives(self.sequence)
+
+            self.assertListEqual(
+                [(motive.sequence, motive.positions) for motive in motives],
+                [(motive.sequence, motive.positions) for motive in levelwise_motives],
+            )
+
+    def test_ngram_engine_should_find_same_motives_as_levelwise(self):
+        for min_frequency, num_sequences, max_length in [
+            (1, 3, 3),
+            (2, 2, 5),
+            (1, 5, 4),
+        ]:
+            motives = MotiveGenerator(
+                min_frequency=min_frequency,
+                max_gap=0,
+                max_length=max_length,
+                min_num_sequences=num_sequences,
+                max_num_sequences=num_sequences,
+                engine=MiningEngine.NGRAM,
+            ).generate_motives(self.sequence)
+
+            levelwise_motives = MotiveGenerator(
+                min_frequency=min_frequency,
+                max_gap=0,
+                max_length=max_length,
+                min_num_sequences=num_sequences,
+                max_num_sequences=num_sequences,
+                engine=MiningEngine.LEVELWISE,
+            ).generate_motives(self.sequence)
+
+            self.assertListEqual(
+                [(motive.sequence, motive.positions) for motive in motives],
+                [(motive.sequence, motive.positions) for motive in levelwise_motives],
+            )
+
+    def test_ngram_engine_should_only_support_a_single_length_without_gaps(self):
+        for max_gap, min_num_sequences, max_num_sequences in [(1, 3, 3), (0, 2, 3)]:
+            with self.assertRaises(ValueError):
+                MotiveGenerator(
+                    min_frequency=1,
+                    max_gap=max_gap,
+                    max_length=5,
+                    min_num_sequences=min_num_sequences,
+                    max_num_sequences=max_num_sequences,
+                    engine=MiningEngine.NGRAM,
+                )
+
+    def test_pruning_breaks_should_find_same_motives(self):
+        rest = encode_interval(BreakInterval(type=RestIntervalType.REST_BEFORE))
+        sequence = [2, 2, rest, -3, 2, 2, -3, rest, 2, -3, 2, 2]
+        for max_gap in (0, 1, 2):
+            motives = MotiveGenerator(
+                min_frequency=2,
+                max_gap=max_gap,
+                max_length=5,
+                min_num_sequences=2,
+                max_num_sequences=3,
+                prune_breaks=False,
+            ).find_voice_motives(sequence)
+
+            for engine in MiningEngine:
+                if engine is MiningEngine.SUFFIX_ARRAY and max_gap != 0:
+                    continue
+                if engine is MiningEngine.NGRAM:
+                    continue
+                pruned_motives = MotiveGenerator(
+                    min_frequency=2,
+                    max_gap=max_gap,
+                    max_length=5,
+                    min_num_sequences=2,
+                    max_num_sequences=3,
+                    engine=engine,
+                ).find_voice_motives(sequence)
+
+                self.assertListEqual(
+                    [(motive.sequence, motive.positions) for motive in pruned_motives],
+                    [(motive.sequence, motive.positions) for motive in motives],
+                )
+
+        motives = MotiveGenerator(
+            min_frequency=2,
+            max_gap=1,
+            max_length=5,
+            min_num_sequences=2,
+            max_num_sequences=2,
+        ).find_voice_motives(sequence)
+        skipping_motive = next(
+            motive for motive in motives if motive.sequence == (2, -3)
+        )
+        self.assertIn(Occurrence(position=1, length=3), skipping_motive.positions)
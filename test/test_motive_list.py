@@ -0,0 +1,85 @@
+import unittest
+
+from Motive import Motive
+from MotiveList import MotiveList
+from MotivePosition import MotivePosition
+from Occurrence import Occurrence
+from SequenceType import SequenceType
+
+
+class MotiveListTest(unittest.TestCase):
+    def motive(self, sequence, position):
+        return Motive(
+            positions=[Occurrence(position=position, length=len(sequence))],
+            sequence=sequence,
+        )
+
+    def test_should_add_sequence_types_to_existing_motive(self):
+        motive_list = MotiveList(motives=[])
+
+        motive_list.add([self.motive((3, -2), 0)], "piece", "part", "0")
+        motive_list.add(
+            [self.motive((2, -3), 4), self.motive((-2, 3), 8), self.motive((4, 4), 9)],
+            "piece",
+            "part",
+            "1",
+        )
+
+        self.assertEqual(len(motive_list), 2)
+        positions = motive_list[0].positions
+        self.assertEqual(
+            positions[SequenceType.MIRRORED]["piece"]["part"]["1"],
+            [MotivePosition(position=4, length=2)],
+        )
+        self.assertEqual(
+            positions[SequenceType.MIRRORED_INVERTED]["piece"]["part"]["1"],
+            [MotivePosition(position=8, length=2)],
+        )
+
+    def test_should_add_to_read_motives(self):
+        motive_list = MotiveList(motives=[])
+        motive_list.add([self.motive((3, -1), 0)], "piece", "part", "0")
+        motive_list.add([self.motive((5, 2), 0)], "piece", "part", "0")
+
+        read_list = MotiveList.model_validate_json(motive_list.model_dump_json())
+        read_list.add(
+            [self.motive((-3, 1), 2), self.motive((-5, -2), 3)], "piece", "part", "1"
+        )
+
+        self.assertEqual(len(read_list), 2)
+        self.assertEqual(
+            read_list[0].positions[SequenceType.INVERTED]["piece"]["part"]["1"],
+            [MotivePosition(position=2, length=2)],
+        )
+        self.assertEqual(
+            read_list[1].positions[SequenceType.INVERTED]["piece"]["part"]["1"],
+            [MotivePosition(position=3, length=2)],
+        )
+
+    def test_should_store_positions_in_columns(self):
+        motive_lists = [MotiveList(motives=[]), MotiveList.columnar()]
+        for motive_list in motive_lists:
+            motive_list.add(
+                [self.motive((3, -2), 0), self.motive((4, 4), 3)], "a", "part", "0"
+            )
+            motive_list.add(
+                [self.motive((2, -3), 4), self.motive((3, -2), 6)], "b", "part", "1"
+            )
+            motive_list.add([self.motive((-3, 2), 2)], "a", "part", "1")
+
+        nested_list, columnar_list = motive_lists
+        self.assertEqual(columnar_list.model_dump_json(), nested_list.model_dump_json())
+        for nested_motive, columnar_motive in zip(nested_list, columnar_list):
+            self.assertEqual(
+                columnar_motive.nested_positions(), nested_motive.positions
+            )
+            self.assertEqual(columnar_motive.frequency(), nested_motive.frequency())
+            for sequence_type in SequenceType:
+                self.assertEqual(
+                    columnar_motive.frequency(sequence_type),
+                    nested_motive.frequency(sequence_type),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
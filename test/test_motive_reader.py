@@ -0,0 +1,90 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from Motive import Motive
+from MotiveList import MotiveList
+from MotiveReader import (
+    iterate_json_array,
+    iterate_motives_from_file,
+    iterate_motives_from_json_file,
+)
+from MotiveWriter import write_motives_as_json_to_file, write_motives_as_npz_to_file
+from Occurrence import Occurrence
+from OutputCompression import OutputCompression
+
+
+class MotiveReaderTest(unittest.TestCase):
+    def motive_list(self) -> MotiveList:
+        motive_list = MotiveList(motives=[])
+        motive_list.add(
+            [
+                Motive(positions=[Occurrence(position=0, length=2)], sequence=(3, -2)),
+                Motive(
+                    positions=[
+                        Occurrence(position=1, length=3),
+                        Occurrence(position=7, length=3),
+                    ],
+                    sequence=(2, 2, -4),
+                ),
+            ],
+            "piece",
+            "part",
+            "0",
+        )
+        return motive_list
+
+    def test_should_read_written_motives(self):
+        motive_list = self.motive_list()
+        for compression in OutputCompression.NONE, OutputCompression.GZIP:
+            for pretty in True, False:
+                with tempfile.TemporaryDirectory() as folder:
+                    path = write_motives_as_json_to_file(
+                        motive_list, Path(folder), compression, pretty
+                    )
+
+                    with patch("MotiveReader._CHUNK_SIZE", 3):
+                        motives = list(iterate_motives_from_json_file(path))
+
+                self.assertEqual(
+                    MotiveList(motives=motives).model_dump_json(),
+                    motive_list.model_dump_json(),
+                )
+
+    def test_should_read_npz_motives(self):
+        for motive_list in [MotiveList(motives=[]), self.motive_list()]:
+            for compression in OutputCompression.NONE, OutputCompression.GZIP:
+                with tempfile.TemporaryDirectory() as folder:
+                    path = write_motives_as_npz_to_file(
+                        motive_list, Path(folder), compression
+                    )
+
+                    self.assertEqual(path.name, "output.npz")
+                    motives = list(iterate_motives_from_file(path))
+
+                self.assertEqual(
+                    MotiveList(motives=motives).model_dump_json(),
+                    motive_list.model_dump_json(),
+                )
+
+    def test_should_iterate_json_array_of_key(self):
+        file = io.StringIO('{"other": [1, {"a": 2}], "values" : [ 1, "]", {"b": []} ]}')
+
+        self.assertListEqual(
+            list(iterate_json_array(file, "values")), [1, "]", {"b": []}]
+        )
+        self.assertListEqual(
+            list(iterate_json_array(io.StringIO('{"values": []}'), "values")), []
+        )
+
+    def test_should_fail_on_incomplete_json(self):
+        file = io.StringIO('{"values": [1, {"a": ')
+
+        with self.assertRaises(ValueError):
+            list(iterate_json_array(file, "values"))
+
+
+if __name__ == "__main__":
+    unittest.main()
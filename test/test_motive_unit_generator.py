@@ -0,0 +1,45 @@
+import unittest
+from array import array
+
+from EncodedVoice import EncodedVoice, REST
+from GeneralInterval import RestIntervalType, decode_interval
+from MotiveUnitGenerator import encode_intervals, NO_BREAK, MotiveUnitGenerator
+
+
+class MotiveUnitGeneratorTest(unittest.TestCase):
+    def test_should_encode_intervals_and_breaks(self):
+        voice = EncodedVoice(
+            id="0", diatonic_note_numbers=array("h", [29, 29, 31, 28, REST, REST, 30])
+        )
+
+        intervals, break_types = encode_intervals(voice)
+
+        self.assertListEqual(intervals[:3].tolist(), [1, 3, -4])
+        self.assertListEqual(
+            break_types.tolist(),
+            [
+                NO_BREAK,
+                NO_BREAK,
+                NO_BREAK,
+                RestIntervalType.NOTE_BEFORE,
+                RestIntervalType.REST_BEFORE,
+                RestIntervalType.NOTE_AFTER,
+            ],
+        )
+
+        codes = MotiveUnitGenerator.original_from_encoded_voice(voice)
+        self.assertListEqual(
+            [str(decode_interval(code)) for code in codes.tolist()],
+            ["1", "3", "-4", "NOTE_BEFORE", "REST_BEFORE", "NOTE_AFTER"],
+        )
+
+    def test_should_encode_short_voices(self):
+        for numbers in ([], [29]):
+            voice = EncodedVoice(id="0", diatonic_note_numbers=array("h", numbers))
+            self.assertListEqual(
+                MotiveUnitGenerator.original_from_encoded_voice(voice).tolist(), []
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
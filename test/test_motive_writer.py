@@ -0,0 +1,104 @@
+import gzip
+import io
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from Motive import Motive
+from MotiveList import MotiveList
+from MotiveWriter import (
+    write_motives_as_json,
+    write_motives_as_json_to_file,
+    write_motives_as_sqlite_to_file,
+)
+from Occurrence import Occurrence
+from OutputCompression import OutputCompression
+
+
+class MotiveWriterTest(unittest.TestCase):
+    def motive_list(self) -> MotiveList:
+        motive_list = MotiveList(motives=[])
+        motive_list.add(
+            [
+                Motive(positions=[Occurrence(position=0, length=2)], sequence=(3, -2)),
+                Motive(
+                    positions=[
+                        Occurrence(position=1, length=3),
+                        Occurrence(position=7, length=3),
+                    ],
+                    sequence=(2, 2, -4),
+                ),
+            ],
+            "piece",
+            "part",
+            "0",
+        )
+        return motive_list
+
+    def test_should_write_same_json_as_model_dump(self):
+        for motive_list in [MotiveList(motives=[]), self.motive_list()]:
+            for pretty, expected in [
+                (True, motive_list.model_dump_json(indent=2)),
+                (False, motive_list.model_dump_json()),
+            ]:
+                file = io.StringIO()
+                write_motives_as_json(motive_list, file, pretty)
+                self.assertEqual(file.getvalue(), expected)
+
+    def test_should_write_compressed_file(self):
+        motive_list = self.motive_list()
+        with tempfile.TemporaryDirectory() as folder:
+            path = write_motives_as_json_to_file(
+                motive_list, Path(folder), OutputCompression.GZIP
+            )
+
+            self.assertEqual(path.name, "output.json.gz")
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                self.assertEqual(file.read(), motive_list.model_dump_json(indent=2))
+
+    def test_should_write_sqlite_file(self):
+        motive_list = self.motive_list()
+        motive_list.add(
+            [Motive(positions=[Occurrence(position=4, length=2)], sequence=(2, -3))],
+            "other piece",
+            "part",
+            "0",
+        )
+        with tempfile.TemporaryDirectory() as folder:
+            path = write_motives_as_sqlite_to_file(motive_list, Path(folder))
+
+            connection = sqlite3.connect(path)
+            try:
+                self.assertListEqual(
+                    connection.execute(
+                        "SELECT id, frequency, frequency_original, frequency_mirrored"
+                        " FROM motives ORDER BY id"
+                    ).fetchall(),
+                    [(0, 2, 1, 1), (1, 2, 2, 0)],
+                )
+                self.assertListEqual(
+                    connection.execute(
+                        """
+                        SELECT pieces.title, occurrences.position
+                        FROM motive_intervals
+                        JOIN occurrences
+                            ON occurrences.motive_id = motive_intervals.motive_id
+                        JOIN sequence_types
+                            ON sequence_types.id = occurrences.sequence_type_id
+                        JOIN voices ON voices.id = occurrences.voice_id
+                        JOIN parts ON parts.id = voices.part_id
+                        JOIN pieces ON pieces.id = parts.piece_id
+                        WHERE motive_intervals.intervals = ?
+                            AND sequence_types.name = 'MIRRORED'
+                        """,
+                        ("['3', '-2']",),
+                    ).fetchall(),
+                    [("other piece", 4)],
+                )
+            finally:
+                connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from GeneralInterval import BreakInterval, RestIntervalType, encode_interval
+from Orbit import Orbit
+from SequenceType import SequenceType
+
+
+class OrbitTest(unittest.TestCase):
+    def test_sequence_types_should_share_orbit(self):
+        orbit = Orbit.from_codes((3, -2, 1))
+
+        for sequence_type, codes in [
+            (SequenceType.ORIGINAL, (3, -2, 1)),
+            (SequenceType.INVERTED, (-3, 2, 1)),
+            (SequenceType.MIRRORED, (1, 2, -3)),
+            (SequenceType.MIRRORED_INVERTED, (1, -2, 3)),
+        ]:
+            other = Orbit.from_codes(codes)
+            self.assertEqual(other.representative, orbit.representative)
+            self.assertEqual(orbit.get_sequence_type(other), sequence_type)
+
+        self.assertIsNone(orbit.get_sequence_type(Orbit.from_codes((3, -2, 2))))
+
+    def test_should_return_first_sequence_type_of_symmetric_sequences(self):
+        orbit = Orbit.from_codes((2, -2))
+
+        self.assertEqual(
+            orbit.get_sequence_type(Orbit.from_codes((2, -2))), SequenceType.ORIGINAL
+        )
+        self.assertEqual(
+            orbit.get_sequence_type(Orbit.from_codes((-2, 2))), SequenceType.INVERTED
+        )
+
+    def test_breaks_should_not_be_inverted(self):
+        rest = encode_interval(BreakInterval(type=RestIntervalType.REST_BEFORE))
+        orbit = Orbit.from_codes((rest, 2))
+
+        self.assertEqual(
+            orbit.get_sequence_type(Orbit.from_codes((-2, rest))),
+            SequenceType.MIRRORED,
+        )
+
+    def test_descending_unison_should_have_no_orbit(self):
+        self.assertIsNone(Orbit.from_codes((2, -1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from Corpus import Corpus
+from ParseCache import ParseCache
+from ParseOptions import ParseOptions, ChordTreatment
+
+
+class ParseCacheTest(unittest.TestCase):
+    options = ParseOptions()
+
+    def setUp(self):
+        self.cache_folder = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_folder)
+
+    def test_warm_run_does_not_parse_files(self):
+        folder = Path("testData/multiple_pieces/same_motives")
+        cache = ParseCache(self.cache_folder)
+
+        cold = Corpus.parse(folder, self.options, cache=cache)
+        with mock.patch("Corpus.Piece.parse") as parse:
+            warm = Corpus.parse(folder, self.options, cache=cache)
+            parse.assert_not_called()
+
+        self.assertEqual(warm, cold)
+        self.assertEqual(
+            warm.pieces,
+            [piece.encode() for piece in Corpus.parse(folder, self.options).pieces],
+        )
+
+    def test_key_depends_on_options_and_content(self):
+        cache = ParseCache(self.cache_folder)
+        file = Path("testData/parsing/basic/basic.musicxml")
+        other_file = Path("testData/parsing/basic/ties.musicxml")
+
+        key = cache.key(file, self.options)
+
+        self.assertEqual(cache.key(file, ParseOptions()), key)
+        self.assertNotEqual(
+            cache.key(file, ParseOptions(chord_treatment=ChordTreatment.LOWEST)), key
+        )
+        self.assertNotEqual(cache.key(other_file, self.options), key)
+
+    def test_unreadable_entry_is_removed(self):
+        cache = ParseCache(self.cache_folder)
+        entry = cache.entry_path("broken")
+        entry.write_text("{")
+
+        self.assertIsNone(cache.load("broken", "title"))
+        self.assertFalse(entry.exists())
+
+    def test_evict_removes_least_recently_used_entries(self):
+        folder = Path("testData/multiple_pieces/different_motives")
+        cache = ParseCache(self.cache_folder)
+        Corpus.parse(folder, self.options, cache=cache)
+
+        entries = list(self.cache_folder.glob("*.json"))
+        self.assertEqual(len(entries), 2)
+
+        cache.max_size = max(entry.stat().st_size for entry in entries)
+        cache.evict()
+
+        self.assertEqual(len(list(self.cache_folder.glob("*.json"))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
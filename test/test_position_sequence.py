@@ -0,0 +1,38 @@
+import unittest
+
+from Occurrence import Occurrence
+from PositionSequence import PositionSequence
+
+
+def positions(*pairs):
+    return [Occurrence(position=position, length=length) for position, length in pairs]
+
+
+class PositionSequenceTest(unittest.TestCase):
+    def test_should_remove_same_positions_in_order(self):
+        sequence = PositionSequence(positions((5, 2), (1, 2), (5, 2), (5, 3), (1, 2)))
+
+        self.assertListEqual(sequence.sequence, positions((5, 2), (1, 2), (5, 3)))
+
+    def test_should_merge(self):
+        sequence = PositionSequence(positions((5, 2), (1, 2)))
+        sequence.merge(PositionSequence(positions((1, 2), (0, 3))))
+
+        self.assertListEqual(sequence.sequence, positions((5, 2), (1, 2), (0, 3)))
+
+    def test_should_merge_sorted_sequences(self):
+        merged = PositionSequence.merge_sorted(
+            [
+                PositionSequence(positions((0, 2), (3, 2), (7, 2))),
+                PositionSequence(positions((1, 2), (3, 2), (3, 4))),
+                PositionSequence([]),
+            ]
+        )
+
+        self.assertListEqual(
+            merged.sequence, positions((0, 2), (1, 2), (3, 2), (3, 4), (7, 2))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
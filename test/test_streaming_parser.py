@@ -0,0 +1,49 @@
+import itertools
+import tempfile
+import unittest
+from pathlib import Path
+
+from ParseOptions import ParseOptions, ChordTreatment, RestTreatment, ParserBackend
+from Piece import Piece
+from StreamingParser import parse_parts, UnsupportedMusicXmlError
+
+
+class StreamingParserTest(unittest.TestCase):
+    def test_should_extract_same_voices_as_music21(self):
+        for file, rest_treatment, chord_treatment in itertools.product(
+            sorted(Path("testData/parsing/basic").glob("*.musicxml")),
+            RestTreatment,
+            ChordTreatment,
+        ):
+            options = ParseOptions(rest_treatment, chord_treatment)
+            with self.subTest(
+                file=file.name,
+                rest_treatment=rest_treatment,
+                chord_treatment=chord_treatment,
+            ):
+                self.assertEqual(
+                    parse_parts(file, options),
+                    Piece.parse(file, options).encode().parts,
+                )
+
+    def test_should_fall_back_to_music21_for_multiple_staves(self):
+        source = Path("testData/parsing/basic/basic.musicxml")
+        with tempfile.TemporaryDirectory() as folder:
+            file = Path(folder) / "staves.musicxml"
+            file.write_text(
+                source.read_text().replace(
+                    "<attributes>", "<attributes><staves>2</staves>", 1
+                )
+            )
+
+            with self.assertRaises(UnsupportedMusicXmlError):
+                parse_parts(file)
+
+            piece = Piece.parse(
+                file, ParseOptions(parser_backend=ParserBackend.STREAMING)
+            )
+            self.assertEqual(piece.encode(), Piece.parse(file).encode())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+import numpy as np
+
+from SuffixArray import rank_by_first_appearance, suffix_array, lcp_array
+
+
+class SuffixArrayTest(unittest.TestCase):
+    def test_should_sort_suffixes_by_first_appearance_rank(self):
+        codes = np.array([5, -3, 5, -3, 5, 2])
+
+        ranks = rank_by_first_appearance(codes)
+        suffixes = suffix_array(ranks)
+
+        self.assertListEqual(ranks.tolist(), [0, 1, 0, 1, 0, 2])
+        self.assertListEqual(
+            suffixes.tolist(),
+            sorted(range(len(codes)), key=lambda i: ranks[i:].tolist()),
+        )
+        self.assertListEqual(lcp_array(ranks, suffixes).tolist(), [0, 3, 1, 0, 2, 0])
+
+    def test_should_handle_empty_sequences(self):
+        ranks = rank_by_first_appearance(np.array([], dtype=np.int16))
+
+        self.assertListEqual(suffix_array(ranks).tolist(), [])
+        self.assertListEqual(lcp_array(ranks, suffix_array(ranks)).tolist(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()